@@ -4,18 +4,48 @@ Freqtrade Strategy Backtesting and Comparison Tool
 This script automatically backtests all strategies and compares their performance.
 """
 
+import os
 import re
+import sys
 import json
+import math
+import mmap
 import time
 import psutil
+import hashlib
+import signal
+import asyncio
+import contextlib
 import logging
 import argparse
+import threading
 import subprocess
-import concurrent.futures
 import multiprocessing
+import concurrent.futures
 from pathlib import Path
 from datetime import datetime
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Tuple
+
+# orjson parses and serializes directly from/to bytes; fall back to stdlib json if missing
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# fcntl is only available on POSIX; the result index is written unlocked elsewhere
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+
+# Shared result utilities live next to this script; results are read from individual files without them
+_HERE = os.path.dirname(os.path.abspath(__file__))
+if _HERE not in sys.path:
+    sys.path.insert(0, _HERE)
+try:
+    import utils as strategy_utils
+except ImportError:
+    strategy_utils = None
 
 # Configure logging
 logging.basicConfig(
@@ -28,19 +58,100 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+def json_loads(data: bytes):
+    """Parse JSON bytes, using orjson when available."""
+    return orjson.loads(data) if orjson else json.loads(data)
+
+def json_dumps(data, indent: bool = False) -> bytes:
+    """Serialize data to compact (or 2-space indented) JSON bytes, using orjson when available."""
+    if orjson:
+        return orjson.dumps(data, option=orjson.OPT_INDENT_2 if indent else None)
+    if indent:
+        return json.dumps(data, indent=2).encode()
+    return json.dumps(data, separators=(',', ':')).encode()
+
+# Result files at least this large are memory-mapped instead of read into a buffer
+MMAP_MIN_SIZE = 4096
+
+def load_json_file(path) -> Dict:
+    """Parse a JSON file, mapping larger files straight into orjson without a read copy."""
+    fd = os.open(path, os.O_RDONLY)
+    try:
+        size = os.fstat(fd).st_size
+        if orjson is None or size < MMAP_MIN_SIZE:
+            return json_loads(os.read(fd, size))
+        with mmap.mmap(fd, 0, access=mmap.ACCESS_READ) as mm, memoryview(mm) as view:
+            return orjson.loads(view)
+    finally:
+        os.close(fd)
+
+# Matches timeframe, TIMEFRAME and informative_timeframe assignments in a single pass
+TIMEFRAME_PATTERN = re.compile(rb'timeframe\s*=\s*["\']([^"\']+)["\']', re.IGNORECASE)
+
+# Summary table parsers: each returns the parsed value or None when the cell has no usable unit
+def _parse_percent(value: str) -> Optional[float]:
+    return float(value.replace('%', '')) if '%' in value else None
+
+def _parse_usdt(value: str) -> Optional[float]:
+    return float(value.replace('USDT', '').strip()) if 'USDT' in value else None
+
+def _parse_text(value: str) -> str:
+    return value
+
+# Lowercased summary table label -> (metrics key, value parser)
+SUMMARY_LABEL_PARSERS = {
+    'total profit %': ('total_profit_percent', _parse_percent),
+    'absolute profit': ('total_profit_abs', _parse_usdt),
+    'sharpe': ('sharpe_ratio', float),
+    'profit factor': ('profit_factor', float),
+    'best pair': ('best_pair', _parse_text),
+    'worst pair': ('worst_pair', _parse_text),
+    'max % of account underwater': ('max_drawdown', _parse_percent),
+    'absolute drawdown (account)': ('max_drawdown', _parse_percent),
+    'market change': ('market_change', _parse_percent),
+}
+
+# Single-pass matcher for every summary table label; captures (label, value) from
+# '│ label │ value │' rows so other box-drawing rows are never split
+SUMMARY_LABEL_PATTERN = re.compile(
+    r'[^│]*│\s*(' + '|'.join(re.escape(label) for label in SUMMARY_LABEL_PARSERS) + r')\s*│\s*([^│]*?)\s*│',
+    re.IGNORECASE
+)
+
+# Individual result file name suffixes; the strategy name is the part before them
+RESULT_FILE_SUFFIX = '_result.json'
+FAILED_FILE_SUFFIX = '_failed.json'
+
+# Maximum length of a single freqtrade output line read from the subprocess pipe
+STREAM_LINE_LIMIT = 1024 * 1024
+
 class StrategyBacktester:
-    def __init__(self, config_path: str = "user_data/config.json", max_workers: int = None):
+    def __init__(self, config_path: str = "user_data/config.json", max_workers: int = None, in_process: bool = False):
         self.config_path = config_path
         self.results_dir = Path("user_data/backtest_results")
         self.results_dir.mkdir(parents=True, exist_ok=True)
+        self._results_dir_str = str(self.results_dir)
         
         # Backtest parameters
         self.start_date = "20240101"
         self.end_date = "20241231"
         self.timeframe = "5m"
         
-        # Parallel processing settings
-        self.max_workers = max_workers or min(multiprocessing.cpu_count(), 6)
+        # Parallel processing settings. Without an explicit worker count, start small and
+        # scale with the memory each backtest is observed to use (capped at CPU count).
+        self.adaptive_workers = max_workers is None
+        self.max_workers = max_workers or min(multiprocessing.cpu_count(), 2)
+        self.rss_samples_before_tuning = 3
+        self.memory_headroom = 0.8  # Fraction of total memory backtests may use
+        self._peak_rss_samples = []
+        self._shrink_acquires = set()  # Semaphore acquires holding the slots given up by a shrink
+        self._running_backtests = 0  # Backtests currently holding a semaphore slot
+        self._memory_sample = None  # (sequence number, available, total, running backtests) from the monitor
+        self._tuned_sample_seq = 0  # Sequence number of the memory sample the last resize was based on
+        
+        # Run backtests through freqtrade's Python API instead of one subprocess per strategy
+        self.in_process = in_process
+        self._bt_data_cache = {}  # (timeframe, startup candles, pairs) -> (data, timerange) loaded in-process
         
         # Timeout settings
         self.strategy_timeout = 300  # 5 minutes per strategy
@@ -49,81 +160,129 @@ class StrategyBacktester:
         # Results storage
         self.results = {}
         self.failed_strategies = []
+        self._results_cache_mtime = None  # Results directory mtimes at the last collect_all_results
+        self._results_name_set = set()  # Names in self.results, kept in step with every write
+        self._failed_name_set = set()  # Names in self.failed_strategies
+        self._parsed_result_files = {}  # Individual result file path -> (mtime_ns, parsed result)
+        self._saved_failures = {}  # Failure records saved during the current batch, merged instead of reloaded
         
         # Individual strategy results directory
         self.individual_results_dir = self.results_dir / "individual_results"
         self.individual_results_dir.mkdir(exist_ok=True)
         
+        # Sidecar index of saved results: strategy_name -> [start_date, end_date, result_filename]
+        self.result_index_file = self.individual_results_dir / "_index.json"
+        self._result_index = self.load_result_index()
+        self._pending_index_entries = {}  # Index entries recorded since the last flush_result_index
+        
+        # Names of files already in individual_results, listed once instead of stat'ing per strategy
+        self._result_file_names = set(os.listdir(self.individual_results_dir))
+        
+        # Shared result utilities, imported once; None means results are read from individual_results only
+        self._utils = self.load_shared_utils()
+        
+        # Strategies directory and cached scan of its strategy files
+        self.strategies_dir = Path("user_data/strategies")
+        self._strategy_scan = None
+        self._discovery_cache = None  # (strategies_dir mtime_ns, discovered strategy names)
+        self.scan_workers = 32  # Threads used to read strategy files
+        self.cleanup_workers = 8  # Threads used to remove empty result directories
+        self.result_load_workers = 64  # Reads kept in flight when loading result files (helps on NFS/SMB)
+        
         # Timeframe cache for strategy analysis
         self.timeframe_cache = {}
         
-        logger.info(f"Initialized backtester with {self.max_workers} workers")
+        # Freqtrade version, probed once on first use
+        self._freqtrade_version = None
+        
+        # Digest of the config file, part of every result's input digest
+        self._config_digest = None
+        
+        logger.info(f"Initialized backtester with {self.max_workers} workers" + (" (adaptive)" if self.adaptive_workers else ""))
 
+    def load_shared_utils(self):
+        """Create the shared utils results helper for this results directory."""
+        if strategy_utils is None:
+            logger.warning("Shared utils are unavailable, results will be read from individual files")
+            return None
+        return strategy_utils.StrategyResultsUtils(self._results_dir_str)
+    
+    def _scan_strategies(self) -> Dict[str, Dict]:
+        """
+        Scan every strategy file once, recording compatibility and timeframe.
+        
+        Returns:
+            Dict of strategy_name -> {'compatible': bool, 'timeframe': str, 'content_digest': str}
+        """
+        if self._strategy_scan is not None:
+            return self._strategy_scan
+        
+        scan = {}
+        if not self.strategies_dir.exists():
+            self._strategy_scan = scan
+            return scan
+        
+        with os.scandir(self.strategies_dir) as entries:
+            strategy_dirs = sorted(entry.path for entry in entries if entry.is_dir() and not entry.name.startswith('.'))
+        
+        # Reads release the GIL, so overlap them across a thread pool
+        with concurrent.futures.ThreadPoolExecutor(max_workers=self.scan_workers) as executor:
+            for scanned in executor.map(self._scan_strategy_file, strategy_dirs):
+                if scanned:
+                    strategy_name, strategy_info = scanned
+                    scan[strategy_name] = strategy_info
+                    self.timeframe_cache[strategy_name] = strategy_info['timeframe']
+        
+        self._strategy_scan = scan
+        return scan
+    
+    def _scan_strategy_file(self, strategy_dir: str) -> Optional[Tuple[str, Dict]]:
+        """Read one strategy directory's <name>.py and extract its scan info."""
+        # Only directories with a Python file of the same name are strategies
+        strategy_name = os.path.basename(strategy_dir)
+        strategy_file = Path(strategy_dir) / f"{strategy_name}.py"
+        try:
+            content = strategy_file.read_bytes()
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            logger.warning(f"Error reading strategy file for {strategy_name}: {e}")
+            content = b''
+        
+        # Look for timeframe definitions, falling back to 5m
+        match = TIMEFRAME_PATTERN.search(content)
+        timeframe = match.group(1).decode() if match else "5m"
+        if match:
+            logger.debug(f"Detected timeframe {timeframe} for strategy {strategy_name}")
+        
+        return strategy_name, {
+            'compatible': b'populate_entry_trend' in content,
+            'timeframe': timeframe,
+            'content_digest': hashlib.blake2b(content).hexdigest()
+        }
+    
     def detect_strategy_timeframe(self, strategy_name: str) -> str:
         """Detect optimal timeframe for strategy by analyzing the strategy file."""
         if strategy_name in self.timeframe_cache:
             return self.timeframe_cache[strategy_name]
         
-        strategy_file = Path(f"user_data/strategies/{strategy_name}/{strategy_name}.py")
-        if not strategy_file.exists():
-            self.timeframe_cache[strategy_name] = "5m"
-            return "5m"
-        
         try:
-            with open(strategy_file, 'r') as f:
-                content = f.read()
-            
-            # Look for timeframe definitions
-            timeframe_patterns = [
-                r'timeframe\s*=\s*["\']([^"\']+)["\']',
-                r'TIMEFRAME\s*=\s*["\']([^"\']+)["\']',
-                r'informative_timeframe\s*=\s*["\']([^"\']+)["\']'
-            ]
-            
-            for pattern in timeframe_patterns:
-                matches = re.findall(pattern, content, re.IGNORECASE)
-                if matches:
-                    detected_timeframe = matches[0]
-                    self.timeframe_cache[strategy_name] = detected_timeframe
-                    logger.debug(f"Detected timeframe {detected_timeframe} for strategy {strategy_name}")
-                    return detected_timeframe
-            
-            # Fallback to 5m if no timeframe detected
-            self.timeframe_cache[strategy_name] = "5m"
-            return "5m"
-            
+            strategy_info = self._scan_strategies().get(strategy_name)
         except Exception as e:
             logger.warning(f"Error detecting timeframe for {strategy_name}: {e}")
-            self.timeframe_cache[strategy_name] = "5m"
-            return "5m"
+            strategy_info = None
+        
+        timeframe = strategy_info['timeframe'] if strategy_info else "5m"
+        self.timeframe_cache[strategy_name] = timeframe
+        return timeframe
 
     def get_compatible_strategies(self) -> List[str]:
         """Get list of strategies that are compatible with current freqtrade version."""
         logger.info("Checking strategy compatibility...")
         
-        compatible_strategies = []
-        strategies_dir = Path("user_data/strategies")
-        
         try:
-            # Find all Python files with populate_entry_trend
-            result = subprocess.run(
-                ["grep", "-r", "populate_entry_trend", str(strategies_dir)],
-                capture_output=True,
-                text=True,
-                timeout=30
-            )
-            
-            if result.returncode == 0:
-                # Extract strategy names from file paths
-                for line in result.stdout.split('\n'):
-                    if line.strip() and '.py:' in line:
-                        file_path = line.split(':')[0]
-                        if file_path.endswith('.py'):
-                            # Extract strategy name from path
-                            strategy_path = Path(file_path)
-                            strategy_name = strategy_path.parent.name
-                            if strategy_name not in compatible_strategies:
-                                compatible_strategies.append(strategy_name)
+            # Strategies whose file defines populate_entry_trend
+            compatible_strategies = [name for name, info in self._scan_strategies().items() if info['compatible']]
             
             logger.info(f"Found {len(compatible_strategies)} compatible strategies")
             return sorted(compatible_strategies)
@@ -136,20 +295,11 @@ class StrategyBacktester:
         """Discover strategies by scanning the filesystem."""
         logger.info("Discovering strategies from filesystem...")
         
-        strategies = []
-        strategies_dir = Path("user_data/strategies")
-        
-        if not strategies_dir.exists():
-            logger.error(f"Strategies directory not found: {strategies_dir}")
+        if not self.strategies_dir.exists():
+            logger.error(f"Strategies directory not found: {self.strategies_dir}")
             return []
         
-        # Find all strategy directories
-        for strategy_dir in strategies_dir.iterdir():
-            if strategy_dir.is_dir() and not strategy_dir.name.startswith('.'):
-                # Check if there's a Python file with the same name
-                strategy_file = strategy_dir / f"{strategy_dir.name}.py"
-                if strategy_file.exists():
-                    strategies.append(strategy_dir.name)
+        strategies = list(self._scan_strategies())
         
         logger.info(f"Found {len(strategies)} strategies from filesystem")
         return sorted(strategies)
@@ -161,6 +311,21 @@ class StrategyBacktester:
             logger.info("Discovering compatible strategies only...")
             return self.get_compatible_strategies()
         
+        # freqtrade's listing only changes when strategy directories are added or removed
+        try:
+            strategies_mtime = os.stat(self.strategies_dir).st_mtime_ns
+        except OSError:
+            strategies_mtime = None
+        if strategies_mtime is not None and self._discovery_cache and self._discovery_cache[0] == strategies_mtime:
+            logger.debug("Strategies directory unchanged, reusing discovered strategies")
+            return list(self._discovery_cache[1])
+        
+        strategies = self._discover_strategies_with_freqtrade()
+        self._discovery_cache = (strategies_mtime, strategies)
+        return list(strategies)
+    
+    def _discover_strategies_with_freqtrade(self) -> List[str]:
+        """List strategies through freqtrade, falling back to the filesystem scan."""
         logger.info("Discovering strategies using freqtrade...")
         
         try:
@@ -173,11 +338,12 @@ class StrategyBacktester:
             )
             
             if result.returncode == 0:
-                strategies = []
+                # Set membership keeps deduplication linear in the number of output lines
+                strategies = set()
                 for line in result.stdout.strip().split('\n'):
                     strategy = line.strip()
                     if strategy and not strategy.startswith('2025-'):  # Filter out log lines
-                        strategies.append(strategy)
+                        strategies.add(strategy)
                 
                 logger.info(f"Found {len(strategies)} strategies via freqtrade discovery")
                 return sorted(strategies)
@@ -196,40 +362,167 @@ class StrategyBacktester:
     
     def get_strategy_result_file(self, strategy_name: str) -> Path:
         """Get the file path for a strategy's result."""
-        return self.individual_results_dir / f"{strategy_name}_result.json"
+        return self.individual_results_dir / f"{strategy_name}{RESULT_FILE_SUFFIX}"
+    
+    def load_result_index(self) -> Dict[str, List]:
+        """Load the sidecar index of saved strategy results."""
+        try:
+            return json_loads(self.result_index_file.read_bytes())
+        except FileNotFoundError:
+            return {}
+        except Exception as e:
+            logger.warning(f"⚠️ Could not load result index, ignoring it: {e}")
+            return {}
+    
+    def update_result_index(self, strategy_name: str, result: Dict):
+        """Record a saved result in the sidecar index; flush_result_index writes it to disk."""
+        backtest_config = result.get('backtest_config', {})
+        entry = [
+            backtest_config.get('start_date'),
+            backtest_config.get('end_date'),
+            self.get_strategy_result_file(strategy_name).name,
+            result.get('input_digest')
+        ]
+        self._result_index[strategy_name] = entry
+        self._pending_index_entries[strategy_name] = entry
+    
+    def flush_result_index(self):
+        """Write the index entries recorded since the last flush in one locked rewrite of the index."""
+        if not self._pending_index_entries:
+            return
+        
+        # Merge with the on-disk index under a lock in case another backtester is writing it
+        lock_file = self.individual_results_dir / "_index.lock"
+        try:
+            with open(lock_file, 'w') as lock:
+                if fcntl:
+                    fcntl.flock(lock, fcntl.LOCK_EX)
+                index = self.load_result_index()
+                index.update(self._pending_index_entries)
+                self.write_json_atomic(self.result_index_file, index)
+        except OSError as e:
+            logger.error(f"❌ Failed to write result index: {e}")
+            return
+        self._pending_index_entries.clear()
+        self._result_index.update(index)
+    
+    def get_input_digest(self, strategy_name: str) -> str:
+        """Digest of everything a backtest result depends on: strategy file, config and freqtrade version."""
+        if self._config_digest is None:
+            try:
+                self._config_digest = hashlib.blake2b(Path(self.config_path).read_bytes()).hexdigest()
+            except OSError:
+                self._config_digest = ''
+        
+        strategy_info = self._scan_strategies().get(strategy_name)
+        digest = hashlib.blake2b(digest_size=16)
+        digest.update(strategy_info['content_digest'].encode() if strategy_info else b'')
+        digest.update(self._config_digest.encode())
+        digest.update(self.get_freqtrade_version().encode())
+        return digest.hexdigest()
     
     def load_existing_result(self, strategy_name: str) -> Optional[Dict]:
-        """Load existing backtest result if it exists."""
+        """Load existing backtest result if it exists and its inputs are unchanged."""
+        entry = self._result_index.get(strategy_name)
+        if entry:
+            # Fast path: the index tells us the time period and inputs without parsing the result
+            start_date, end_date, result_filename = entry[:3]
+            input_digest = entry[3] if len(entry) > 3 else None
+            if start_date != self.start_date or end_date != self.end_date:
+                logger.info(f"🔄 Existing result for {strategy_name} uses different parameters, will re-run")
+                return None
+            if input_digest != self.get_input_digest(strategy_name):
+                logger.info(f"🔄 Strategy, config or freqtrade version changed for {strategy_name}, will re-run")
+                return None
+            try:
+                result = load_json_file(self.individual_results_dir / result_filename)
+                logger.info(f"✅ Found existing result for {strategy_name}")
+                return result
+            except FileNotFoundError:
+                return None
+            except Exception as e:
+                logger.warning(f"⚠️ Could not load existing result for {strategy_name}: {e}")
+                return None
+        
+        # Results saved before the index existed
         result_file = self.get_strategy_result_file(strategy_name)
-        if result_file.exists():
+        if result_file.name in self._result_file_names:
             try:
-                with open(result_file, 'r') as f:
-                    result = json.load(f)
-                    # Verify the result is for the same time period
-                    if (result.get('backtest_config', {}).get('start_date') == self.start_date and
-                        result.get('backtest_config', {}).get('end_date') == self.end_date):
-                        logger.info(f"✅ Found existing result for {strategy_name}")
-                        return result
-                    else:
-                        logger.info(f"🔄 Existing result for {strategy_name} uses different parameters, will re-run")
-                        return None
+                result = load_json_file(result_file)
+                # Verify the result is for the same time period
+                backtest_config = result.get('backtest_config', {})
+                if (backtest_config.get('start_date') != self.start_date or
+                    backtest_config.get('end_date') != self.end_date):
+                    logger.info(f"🔄 Existing result for {strategy_name} uses different parameters, will re-run")
+                    return None
+                if result.get('input_digest') != self.get_input_digest(strategy_name):
+                    logger.info(f"🔄 Strategy, config or freqtrade version changed for {strategy_name}, will re-run")
+                    return None
+                logger.info(f"✅ Found existing result for {strategy_name}")
+                self.update_result_index(strategy_name, result)
+                return result
             except Exception as e:
                 logger.warning(f"⚠️ Could not load existing result for {strategy_name}: {e}")
                 return None
         return None
     
+    def write_json_atomic(self, file_path, data, indent: bool = False):
+        """Write JSON to a temporary file and atomically move it into place."""
+        tmp_file = os.fspath(file_path) + '.tmp'
+        with open(tmp_file, 'wb') as f:
+            f.write(json_dumps(data, indent=indent))
+        os.replace(tmp_file, file_path)
+    
+    def _remember_parsed_result(self, file_path: Path, data: Dict):
+        """Seed the fallback loader's cache with a file just written so it isn't read back."""
+        path = os.fspath(file_path)
+        try:
+            self._parsed_result_files[path] = (os.stat(path).st_mtime_ns, data)
+        except OSError:
+            pass
+    
     def save_strategy_result(self, strategy_name: str, result: Dict):
         """Save strategy result to file."""
         result_file = self.get_strategy_result_file(strategy_name)
         try:
-            with open(result_file, 'w') as f:
-                json.dump(result, f, indent=2)
+            self.write_json_atomic(result_file, result)
+            self._remember_parsed_result(result_file, result)
+            self._result_file_names.add(result_file.name)
+            self._results_name_set.add(strategy_name)
+            self.update_result_index(strategy_name, result)
             logger.info(f"💾 Saved result for {strategy_name}")
         except Exception as e:
             logger.error(f"❌ Failed to save result for {strategy_name}: {e}")
     
+    def save_failed_result(self, strategy_name: str, failed_result: Dict):
+        """Save failed strategy result to file."""
+        failed_file = self.individual_results_dir / f"{strategy_name}{FAILED_FILE_SUFFIX}"
+        self._saved_failures[strategy_name] = failed_result
+        try:
+            self.write_json_atomic(failed_file, failed_result)
+            self._remember_parsed_result(failed_file, failed_result)
+            self._result_file_names.add(failed_file.name)
+            self._failed_name_set.add(strategy_name)
+        except Exception as e:
+            logger.error(f"Could not save failed result: {e}")
+    
+    def take_saved_failure(self, strategy_name: str) -> Dict:
+        """Return the failure record saved for a strategy in this batch, with a stub if none was saved."""
+        failed_result = self._saved_failures.pop(strategy_name, None)
+        if failed_result is None:
+            failed_result = {'strategy': strategy_name, 'error': 'No result returned'}
+        return failed_result
+    
     def run_backtest_worker(self, strategy_name: str) -> Optional[Dict]:
-        """Worker function for parallel processing of a single strategy."""
+        """Run a single strategy backtest synchronously."""
+        self.get_freqtrade_version()  # Probe before entering the event loop
+        try:
+            return asyncio.run(self._run_backtest_worker_async(asyncio.Semaphore(1), strategy_name))
+        finally:
+            self.flush_result_index()
+    
+    async def _run_backtest_worker_async(self, sem: asyncio.Semaphore, strategy_name: str) -> Optional[Dict]:
+        """Worker coroutine for concurrent processing of a single strategy."""
         try:
             # Check if we already have a result for this strategy
             existing_result = self.load_existing_result(strategy_name)
@@ -256,20 +549,42 @@ class StrategyBacktester:
                 "--export-filename", str(strategy_results_dir / f"{strategy_name}_backtest.json")
             ]
             
-            # Run the backtest with timeout
-            start_time = time.time()
-            result = subprocess.run(
-                cmd,
-                capture_output=True,
-                text=True,
-                timeout=self.strategy_timeout
-            )
-            end_time = time.time()
+            # Run the backtest with timeout, bounded by the shared semaphore.
+            # Output is parsed line by line and written straight to the output file.
+            metrics = self.create_empty_metrics(strategy_name)
+            output_file = strategy_results_dir / f"{strategy_name}_output.txt"
+            async with self._backtest_slot(sem):
+                start_time = time.time()
+                proc = await asyncio.create_subprocess_exec(
+                    *cmd,
+                    stdout=asyncio.subprocess.PIPE,
+                    stderr=asyncio.subprocess.PIPE,
+                    limit=STREAM_LINE_LIMIT,
+                    start_new_session=True  # Own process group so timeouts can kill its children too
+                )
+                peak_rss = [0]
+                rss_sampler = asyncio.ensure_future(self._sample_peak_rss(proc.pid, peak_rss))
+                try:
+                    with open(output_file, 'w') as out:
+                        stderr_bytes = await asyncio.wait_for(
+                            self._stream_backtest_output(proc, out, metrics, strategy_name),
+                            timeout=self.strategy_timeout
+                        )
+                finally:
+                    rss_sampler.cancel()
+                    # Any error while streaming (timeout, cancellation, an overlong output line, a failed
+                    # write or parse) leaves freqtrade running in its own session, where Ctrl-C won't
+                    # reach it; kill it before its slot is released
+                    if proc.returncode is None:
+                        self.kill_process_group(proc.pid)
+                        await proc.wait()
+                    if peak_rss[0]:
+                        self._peak_rss_samples.append(peak_rss[0])
+                end_time = time.time()
             
-            if result.returncode == 0:
-                # Parse the output to extract key metrics
-                metrics = self.parse_backtest_output(result.stdout, strategy_name)
-                
+            stderr = stderr_bytes.decode(errors='replace')
+            
+            if proc.returncode == 0:
                 # Add metadata
                 metadata = {
                     'execution_time': end_time - start_time,
@@ -282,27 +597,25 @@ class StrategyBacktester:
                         'timeframe': detected_timeframe
                     },
                     'freqtrade_version': self.get_freqtrade_version(),
+                    'input_digest': self.get_input_digest(strategy_name),
                     'command_executed': ' '.join(cmd)
                 }
                 
                 # Combine metrics and metadata
                 full_result = {**metrics, **metadata}
                 
-                # Save detailed output
-                with open(strategy_results_dir / f"{strategy_name}_output.txt", 'w') as f:
-                    f.write(result.stdout)
-                
                 # Save the result to file
                 self.save_strategy_result(strategy_name, full_result)
                 
                 logger.info(f"✅ {strategy_name} completed successfully in {end_time - start_time:.1f}s (timeframe: {detected_timeframe})")
                 return full_result
             else:
-                logger.error(f"❌ {strategy_name} failed: {result.stderr}")
+                logger.error(f"❌ {strategy_name} failed: {stderr}")
+                stdout = output_file.read_text()
                 failed_result = {
                     'strategy': strategy_name,
-                    'error': result.stderr,
-                    'stdout': result.stdout,
+                    'error': stderr,
+                    'stdout': stdout,
                     'detected_timeframe': detected_timeframe,
                     'failed_timestamp': datetime.now().isoformat(),
                     'backtest_config': {
@@ -314,19 +627,14 @@ class StrategyBacktester:
                 }
                 
                 # Save failed result to file
-                failed_file = self.individual_results_dir / f"{strategy_name}_failed.json"
-                try:
-                    with open(failed_file, 'w') as f:
-                        json.dump(failed_result, f, indent=2)
-                except Exception as e:
-                    logger.error(f"Could not save failed result: {e}")
+                self.save_failed_result(strategy_name, failed_result)
                 
                 # Clean up empty strategy directory
                 self.cleanup_failed_strategy_directory(strategy_results_dir, strategy_name)
                 
                 return None
                 
-        except subprocess.TimeoutExpired:
+        except asyncio.TimeoutError:
             logger.error(f"⏰ {strategy_name} timed out after {self.strategy_timeout} seconds")
             failed_result = {
                 'strategy': strategy_name,
@@ -341,12 +649,7 @@ class StrategyBacktester:
             }
             
             # Save failed result to file
-            failed_file = self.individual_results_dir / f"{strategy_name}_failed.json"
-            try:
-                with open(failed_file, 'w') as f:
-                    json.dump(failed_result, f, indent=2)
-            except Exception as e:
-                logger.error(f"Could not save failed result: {e}")
+            self.save_failed_result(strategy_name, failed_result)
             
             # Clean up empty strategy directory
             strategy_results_dir = self.results_dir / strategy_name
@@ -368,12 +671,7 @@ class StrategyBacktester:
             }
             
             # Save failed result to file
-            failed_file = self.individual_results_dir / f"{strategy_name}_failed.json"
-            try:
-                with open(failed_file, 'w') as f:
-                    json.dump(failed_result, f, indent=2)
-            except Exception as e:
-                logger.error(f"Could not save failed result: {e}")
+            self.save_failed_result(strategy_name, failed_result)
             
             # Clean up empty strategy directory
             strategy_results_dir = self.results_dir / strategy_name
@@ -381,8 +679,261 @@ class StrategyBacktester:
             
             return None
 
+    def run_backtest_in_process(self, strategy_name: str) -> Optional[Dict]:
+        """Backtest a single strategy via freqtrade's Python API, reusing this interpreter's imports."""
+        # Check if we already have a result for this strategy
+        existing_result = self.load_existing_result(strategy_name)
+        if existing_result:
+            return existing_result
+        
+        logger.info(f"🔄 In-process backtest of strategy: {strategy_name}")
+        
+        strategy_results_dir = self.results_dir / strategy_name
+        strategy_results_dir.mkdir(exist_ok=True)
+        detected_timeframe = self.detect_strategy_timeframe(strategy_name)
+        backtest_config = {
+            'start_date': self.start_date,
+            'end_date': self.end_date,
+            'config_path': self.config_path,
+            'timeframe': detected_timeframe
+        }
+        
+        try:
+            # Imported lazily: freqtrade is only needed in this mode, and is imported once per run
+            from freqtrade.commands.optimize_commands import setup_optimize_configuration
+            from freqtrade.enums import RunMode
+            from freqtrade.optimize.backtesting import Backtesting
+            
+            # Same arguments the CLI backtest passes to freqtrade
+            args = {
+                'config': [self.config_path],
+                'strategy': strategy_name,
+                'timerange': f"{self.start_date}-{self.end_date}",
+                'timeframe': detected_timeframe,
+                'export': 'trades',
+                'exportfilename': str(strategy_results_dir / f"{strategy_name}_backtest.json")
+            }
+            
+            start_time = time.time()
+            config = setup_optimize_configuration(args, RunMode.BACKTEST)
+            backtesting = Backtesting(config)
+            self.reuse_backtest_data(backtesting)
+            backtesting.start()
+            end_time = time.time()
+            
+            stats = backtesting.results['strategy'][strategy_name]
+        except Exception as e:
+            logger.error(f"💥 {strategy_name} error: {str(e)}")
+            failed_result = {
+                'strategy': strategy_name,
+                'error': str(e),
+                'stdout': '',
+                'detected_timeframe': detected_timeframe,
+                'failed_timestamp': datetime.now().isoformat(),
+                'backtest_config': backtest_config
+            }
+            self.save_failed_result(strategy_name, failed_result)
+            self.cleanup_failed_strategy_directory(strategy_results_dir, strategy_name)
+            return None
+        
+        full_result = {
+            **self.metrics_from_backtest_stats(strategy_name, stats),
+            'execution_time': end_time - start_time,
+            'backtest_timestamp': datetime.now().isoformat(),
+            'detected_timeframe': detected_timeframe,
+            'backtest_config': backtest_config,
+            'freqtrade_version': self.get_freqtrade_version(),
+            'input_digest': self.get_input_digest(strategy_name),
+            'command_executed': 'in-process'
+        }
+        self.save_strategy_result(strategy_name, full_result)
+        
+        logger.info(f"✅ {strategy_name} completed successfully in {end_time - start_time:.1f}s (timeframe: {detected_timeframe})")
+        return full_result
+    
+    def reuse_backtest_data(self, backtesting) -> None:
+        """Serve Backtesting.load_bt_data from candles an earlier in-process backtest already loaded.
+        
+        Each strategy still gets its own Backtesting (and so its own export and .last_result.json),
+        but strategies sharing a timeframe, startup candle count and pair whitelist read the data once.
+        """
+        key = (backtesting.timeframe, backtesting.required_startup, tuple(backtesting.pairlists.whitelist))
+        cached = self._bt_data_cache.get(key)
+        if cached is not None:
+            backtesting.timerange = cached[1]
+            backtesting.load_bt_data = lambda: cached
+            return
+        
+        load_bt_data = backtesting.load_bt_data
+        
+        def load_and_cache():
+            self._bt_data_cache[key] = loaded = load_bt_data()
+            return loaded
+        
+        backtesting.load_bt_data = load_and_cache
+    
+    def metrics_from_backtest_stats(self, strategy_name: str, stats: Dict) -> Dict:
+        """Map freqtrade's per-strategy backtest stats onto the metrics parsed from CLI output."""
+        metrics = self.create_empty_metrics(strategy_name)
+        best_pair = stats.get('best_pair') or {}
+        worst_pair = stats.get('worst_pair') or {}
+        metrics.update({
+            'total_trades': stats.get('total_trades') or 0,
+            'winning_trades': stats.get('wins') or 0,
+            'losing_trades': stats.get('losses') or 0,
+            'win_rate': (stats.get('winrate') or 0.0) * 100,  # Convert to percentage
+            'profit_factor': stats.get('profit_factor') or 0.0,
+            'sharpe_ratio': stats.get('sharpe') or 0.0,
+            'max_drawdown': (stats.get('max_drawdown_account') or 0.0) * 100,  # Convert to percentage
+            'avg_profit': (stats.get('profit_mean') or 0.0) * 100,  # Convert to percentage
+            'total_profit_abs': stats.get('profit_total_abs') or 0.0,
+            'total_profit_percent': (stats.get('profit_total') or 0.0) * 100,  # Convert to percentage
+            'avg_duration': stats.get('holding_avg') or '',
+            'best_pair': best_pair.get('key', ''),
+            'worst_pair': worst_pair.get('key', ''),
+            'backtest_start': stats.get('backtest_start') or '',
+            'backtest_end': stats.get('backtest_end') or '',
+            'market_change': (stats.get('market_change') or 0.0) * 100  # Convert to percentage
+        })
+        return metrics
+    
+    async def _sample_peak_rss(self, pid: int, peak_rss: List[int], interval: float = 1.0):
+        """Track the peak RSS of a backtest process and its children until cancelled."""
+        try:
+            process = psutil.Process(pid)
+            while True:
+                rss = process.memory_info().rss
+                for child in process.children(recursive=True):
+                    try:
+                        rss += child.memory_info().rss
+                    except psutil.Error:
+                        pass
+                peak_rss[0] = max(peak_rss[0], rss)
+                await asyncio.sleep(interval)
+        except psutil.Error:
+            pass  # Process exited
+    
+    def get_memory_worker_target(self) -> Optional[int]:
+        """
+        Number of workers that fit in memory.
+        
+        Returns None until enough RSS samples exist, and until the monitor has taken a memory
+        sample newer than the one the last resize was based on.
+        """
+        if len(self._peak_rss_samples) < self.rss_samples_before_tuning:
+            return None
+        if self._memory_sample is None or self._memory_sample[0] <= self._tuned_sample_seq:
+            return None
+        seq, available, total, running = self._memory_sample
+        avg_rss = sum(self._peak_rss_samples) / len(self._peak_rss_samples)
+        # The sample's available memory already excludes the backtests running when it was taken;
+        # what is left above the reserve kept free for everything else adds (or removes) workers
+        reserve = total * (1 - self.memory_headroom)
+        extra_workers = math.floor((available - reserve) / avg_rss)
+        return max(1, min(multiprocessing.cpu_count(), running + extra_workers))
+    
+    def _resize_worker_limit(self, sem: asyncio.Semaphore, target: int):
+        """Grow or shrink the number of concurrent backtests allowed by the semaphore."""
+        if target > self.max_workers:
+            grow = target - self.max_workers
+            # Give back slots held from an earlier shrink first: cancel acquires still waiting,
+            # release the ones that already took a slot
+            while grow and self._shrink_acquires:
+                acquire = self._shrink_acquires.pop()
+                if acquire.done() and not acquire.cancelled():
+                    sem.release()
+                else:
+                    acquire.cancel()
+                grow -= 1
+            for _ in range(grow):
+                sem.release()
+        else:
+            # Hold the surplus slots as running backtests free them
+            for _ in range(self.max_workers - target):
+                self._shrink_acquires.add(asyncio.ensure_future(sem.acquire()))
+        self.max_workers = target
+        # Wait for a reading that reflects the new limit before tuning again
+        self._tuned_sample_seq = self._memory_sample[0] if self._memory_sample else 0
+    
+    @contextlib.asynccontextmanager
+    async def _backtest_slot(self, sem: asyncio.Semaphore):
+        """Hold a semaphore slot for one backtest, counting the backtests that hold one."""
+        async with sem:
+            self._running_backtests += 1
+            try:
+                yield
+            finally:
+                self._running_backtests -= 1
+    
+    def _cancel_shrink_acquires(self):
+        """Cancel the acquires left over from worker shrinks once a run is over."""
+        for acquire in self._shrink_acquires:
+            acquire.cancel()
+        self._shrink_acquires.clear()
+    
+    def kill_process_group(self, pid: int):
+        """Kill a backtest process together with any subprocesses it spawned."""
+        try:
+            os.killpg(pid, signal.SIGKILL)
+        except ProcessLookupError:
+            pass  # Already exited
+    
+    async def _stream_backtest_output(self, proc, out, metrics: Dict, strategy_name: str) -> bytes:
+        """Parse and save freqtrade stdout as it arrives; returns the collected stderr."""
+        async def consume_stdout():
+            async for raw_line in proc.stdout:
+                line = raw_line.decode(errors='replace')
+                out.write(line)
+                self.parse_backtest_line(line, metrics, strategy_name)
+        
+        stderr_bytes, _ = await asyncio.gather(proc.stderr.read(), consume_stdout())
+        await proc.wait()
+        return stderr_bytes
+
     def run_parallel_backtests(self, strategies: List[str]) -> Dict:
         """Run backtests for strategies in parallel."""
+        # Probe the version and scan strategy files once up front so every
+        # concurrent worker reads them from the shared instance caches
+        self.get_freqtrade_version()
+        self._scan_strategies()
+        
+        self._start_resource_monitor()
+        try:
+            return asyncio.run(self._run_parallel_backtests_async(strategies))
+        finally:
+            self._stop_resource_monitor()
+    
+    def _start_resource_monitor(self, interval: float = 5.0):
+        """Sample memory and CPU usage in a background thread."""
+        self._memory_sample = None
+        self._tuned_sample_seq = 0
+        self._record_memory_sample(psutil.virtual_memory())
+        self._current_cpu = psutil.cpu_percent()
+        self._monitor_stop = threading.Event()
+        self._monitor_thread = threading.Thread(target=self._monitor_resources, args=(interval,), daemon=True)
+        self._monitor_thread.start()
+    
+    def _monitor_resources(self, interval: float):
+        """Refresh the cached resource readings until asked to stop."""
+        while not self._monitor_stop.is_set():
+            self._record_memory_sample(psutil.virtual_memory())
+            self._current_cpu = psutil.cpu_percent(interval=1.0)
+            self._monitor_stop.wait(interval)
+    
+    def _record_memory_sample(self, memory):
+        """Store a memory reading with its sequence number and the backtests running when it was taken."""
+        seq = self._memory_sample[0] + 1 if self._memory_sample else 1
+        self._current_memory = memory.percent
+        self._available_memory = memory.available
+        self._memory_sample = (seq, memory.available, memory.total, self._running_backtests)
+    
+    def _stop_resource_monitor(self):
+        """Stop the background resource monitor."""
+        self._monitor_stop.set()
+        self._monitor_thread.join()
+    
+    async def _run_parallel_backtests_async(self, strategies: List[str]) -> Dict:
+        """Run backtests concurrently as freqtrade subprocesses bounded by max_workers."""
         logger.info(f"🚀 Starting parallel backtesting of {len(strategies)} strategies with {self.max_workers} workers")
         
         # Track results and progress
@@ -390,77 +941,87 @@ class StrategyBacktester:
         failed_results = []
         start_time = time.time()
         
-        # Monitor system resources
-        initial_memory = psutil.virtual_memory().percent
-        initial_cpu = psutil.cpu_percent()
+        # Monitor system resources (sampled by the background monitor thread)
+        initial_memory = self._current_memory
+        initial_cpu = self._current_cpu
         logger.info(f"Initial system state - Memory: {initial_memory:.1f}%, CPU: {initial_cpu:.1f}%")
         
-        # Use ProcessPoolExecutor for parallel execution
-        with concurrent.futures.ProcessPoolExecutor(max_workers=self.max_workers) as executor:
-            # Submit all strategies for processing
-            future_to_strategy = {
-                executor.submit(self.run_backtest_worker, strategy): strategy 
-                for strategy in strategies
-            }
+        # Limit the number of concurrent freqtrade subprocesses
+        sem = asyncio.Semaphore(self.max_workers)
+        
+        # Keep a bounded in-flight set so new launches are queued as soon as slots free up
+        strategies_left = iter(strategies)
+        task_to_strategy = {}
+        pending = set()
+        
+        # Track progress
+        total_strategies = len(strategies)
+        success_count = 0
+        failed_count = 0
+        last_monitor_count = 0
+        
+        while True:
+            # Submit new strategies until the in-flight set is full
+            while len(pending) < self.max_workers * 2:
+                strategy = next(strategies_left, None)
+                if strategy is None:
+                    break
+                task = asyncio.ensure_future(self._run_backtest_worker_async(sem, strategy))
+                task_to_strategy[task] = strategy
+                pending.add(task)
             
-            # Track progress
-            total_strategies = len(strategies)
-            success_count = 0
-            failed_count = 0
+            if not pending:
+                break
             
-            # Process completed futures
-            for future in concurrent.futures.as_completed(future_to_strategy):
-                strategy_name = future_to_strategy[future]
+            # Reap every task that has finished before resubmitting
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                strategy_name = task_to_strategy.pop(task)
                 try:
-                    result = future.result()
+                    result = task.result()
                     if result:
                         completed_results[strategy_name] = result
                         success_count += 1
-                        
-                        # Calculate progress and ETA
-                        completed_count = success_count + failed_count
-                        elapsed_time = time.time() - start_time
-                        progress_pct = completed_count / total_strategies * 100
-                        
-                        if completed_count > 0:
-                            avg_time_per_strategy = elapsed_time / completed_count
-                            remaining_strategies = total_strategies - completed_count
-                            eta_seconds = remaining_strategies * avg_time_per_strategy
-                            eta_minutes = eta_seconds / 60
-                            
-                            logger.info(f"✅ Completed {strategy_name} | Progress: {completed_count}/{total_strategies} ({progress_pct:.1f}%) | Success: {success_count} | ETA: {eta_minutes:.1f}m")
-                        else:
-                            logger.info(f"✅ Completed {strategy_name} | Progress: {completed_count}/{total_strategies} ({progress_pct:.1f}%) | Success: {success_count}")
                     else:
-                        failed_results.append({'strategy': strategy_name, 'error': 'No result returned'})
+                        failed_results.append(self.take_saved_failure(strategy_name))
                         failed_count += 1
-                        
-                        completed_count = success_count + failed_count
-                        progress_pct = completed_count / total_strategies * 100
-                        logger.error(f"❌ Failed {strategy_name} | Progress: {completed_count}/{total_strategies} ({progress_pct:.1f}%) | Success: {success_count} | Failed: {failed_count}")
-                        
-                    # Monitor system resources periodically
-                    if completed_count % 5 == 0:  # Every 5 completed strategies
-                        current_memory = psutil.virtual_memory().percent
-                        current_cpu = psutil.cpu_percent()
-                        
-                        if current_memory > initial_memory + 20:  # If memory increased by 20%
-                            logger.warning(f"⚠️ High memory usage: {current_memory:.1f}% (was {initial_memory:.1f}%)")
-                        
-                        logger.info(f"📊 System status - Memory: {current_memory:.1f}%, CPU: {current_cpu:.1f}%")
-                        
+                        logger.error(f"❌ Failed {strategy_name}")
                 except Exception as e:
                     logger.error(f"💥 Exception processing {strategy_name}: {e}")
+                    self._saved_failures.pop(strategy_name, None)
                     failed_results.append({'strategy': strategy_name, 'error': str(e)})
                     failed_count += 1
-                    
-                    completed_count = success_count + failed_count
-                    progress_pct = completed_count / total_strategies * 100
-                    logger.error(f"💥 Exception {strategy_name} | Progress: {completed_count}/{total_strategies} ({progress_pct:.1f}%) | Success: {success_count} | Failed: {failed_count}")
+            
+            # Calculate progress and ETA once per batch of completions
+            completed_count = success_count + failed_count
+            elapsed_time = time.time() - start_time
+            progress_pct = completed_count / total_strategies * 100
+            avg_time_per_strategy = elapsed_time / completed_count
+            eta_minutes = (total_strategies - completed_count) * avg_time_per_strategy / 60
+            logger.info(f"📊 Progress: {completed_count}/{total_strategies} ({progress_pct:.1f}%) | Success: {success_count} | Failed: {failed_count} | ETA: {eta_minutes:.1f}m")
+            
+            # Tune parallelism to the memory backtests actually use
+            if self.adaptive_workers:
+                target_workers = self.get_memory_worker_target()
+                if target_workers and target_workers != self.max_workers:
+                    logger.info(f"⚙️ Adjusting workers {self.max_workers} -> {target_workers} based on observed backtest memory usage")
+                    self._resize_worker_limit(sem, target_workers)
+            
+            # Monitor system resources periodically
+            if completed_count - last_monitor_count >= 5:  # Every 5 completed strategies
+                last_monitor_count = completed_count
+                current_memory = self._current_memory
+                current_cpu = self._current_cpu
+                
+                if current_memory > initial_memory + 20:  # If memory increased by 20%
+                    logger.warning(f"⚠️ High memory usage: {current_memory:.1f}% (was {initial_memory:.1f}%)")
+                
+                logger.info(f"📊 System status - Memory: {current_memory:.1f}%, CPU: {current_cpu:.1f}%")
+        
+        self._cancel_shrink_acquires()
         
         # Update instance variables
-        self.results = completed_results
-        self.failed_strategies = failed_results
+        self.merge_batch_results(completed_results, failed_results)
         
         # Final summary
         total_time = time.time() - start_time
@@ -477,9 +1038,9 @@ class StrategyBacktester:
         
         return completed_results
 
-    def parse_backtest_output(self, output: str, strategy_name: str) -> Dict:
-        """Parse freqtrade backtest output to extract key metrics."""
-        metrics = {
+    def create_empty_metrics(self, strategy_name: str) -> Dict:
+        """Create the default metrics dict filled in by the output parser."""
+        return {
             'strategy': strategy_name,
             'total_return': 0.0,
             'total_trades': 0,
@@ -499,124 +1060,84 @@ class StrategyBacktester:
             'backtest_end': '',
             'market_change': 0.0
         }
+    
+    def parse_backtest_output(self, output: str, strategy_name: str) -> Dict:
+        """Parse freqtrade backtest output to extract key metrics."""
+        metrics = self.create_empty_metrics(strategy_name)
+        for line in output.split('\n'):
+            self.parse_backtest_line(line, metrics, strategy_name)
+        return metrics
+    
+    def parse_backtest_line(self, line: str, metrics: Dict, strategy_name: str):
+        """Parse a single line of freqtrade backtest output into metrics."""
+        line = line.strip()
         
-        lines = output.split('\n')
-        
-        for line in lines:
-            line = line.strip()
-            
-            # Parse the new freqtrade output format with box-drawing characters
-            if '│' in line:
-                parts = [part.strip() for part in line.split('│')]
-                
-                # Total profit percentage (parts[0] is empty, data in parts[1] and parts[2])
-                if len(parts) >= 4 and 'Total profit %' in parts[1]:
-                    try:
-                        profit_str = parts[2]
-                        if '%' in profit_str:
-                            metrics['total_profit_percent'] = float(profit_str.replace('%', ''))
-                    except:
-                        pass
-                
-                # Absolute profit
-                elif len(parts) >= 4 and 'Absolute profit' in parts[1]:
-                    try:
-                        profit_str = parts[2]
-                        if 'USDT' in profit_str:
-                            metrics['total_profit_abs'] = float(profit_str.replace('USDT', '').strip())
-                    except:
-                        pass
-                
-                # Sharpe ratio
-                elif len(parts) >= 4 and 'Sharpe' in parts[1]:
-                    try:
-                        metrics['sharpe_ratio'] = float(parts[2])
-                    except:
-                        pass
-                
-                # Profit factor
-                elif len(parts) >= 4 and 'Profit factor' in parts[1]:
-                    try:
-                        metrics['profit_factor'] = float(parts[2])
-                    except:
-                        pass
-                
-                # Best Pair
-                elif len(parts) >= 4 and 'Best Pair' in parts[1]:
-                    metrics['best_pair'] = parts[2]
-                
-                # Worst Pair
-                elif len(parts) >= 4 and 'Worst Pair' in parts[1]:
-                    metrics['worst_pair'] = parts[2]
-                
-                # Max drawdown percentage
-                elif len(parts) >= 4 and ('Max % of account underwater' in parts[1] or 'Absolute Drawdown (Account)' in parts[1]):
-                    try:
-                        dd_str = parts[2]
-                        if '%' in dd_str:
-                            metrics['max_drawdown'] = float(dd_str.replace('%', ''))
-                    except:
-                        pass
-                
-                # Market change
-                elif len(parts) >= 4 and 'Market change' in parts[1]:
-                    try:
-                        market_str = parts[2]
-                        if '%' in market_str:
-                            metrics['market_change'] = float(market_str.replace('%', ''))
-                    except:
-                        pass
+        # Parse the new freqtrade output format with box-drawing characters
+        if '│' in line:
+            # Summary metrics table ('│ label │ value │')
+            label_match = SUMMARY_LABEL_PATTERN.match(line)
+            if label_match:
+                metric_key, parse_value = SUMMARY_LABEL_PARSERS[label_match.group(1).lower()]
+                try:
+                    value = parse_value(label_match.group(2))
+                    if value is not None:
+                        metrics[metric_key] = value
+                except ValueError:
+                    pass
             
             # Parse strategy summary table (the final table with strategy name)
-            if strategy_name in line and '│' in line:
-                parts = [part.strip() for part in line.split('│')]
-                if len(parts) >= 9:
-                    try:
-                        # Strategy table format: '' | Strategy | Trades | Avg Profit % | Tot Profit USDT | Tot Profit % | Avg Duration | Win Draw Loss Win% | Drawdown | ''
-                        # Note: parts[0] and parts[-1] are empty strings
-                        metrics['total_trades'] = int(parts[2])
-                        metrics['avg_profit'] = float(parts[3])
-                        
-                        # Parse total profit USDT
-                        metrics['total_profit_abs'] = float(parts[4])
-                        
-                        # Parse total profit %
-                        metrics['total_profit_percent'] = float(parts[5])
-                        
-                        # Parse duration
-                        metrics['avg_duration'] = parts[6]
-                        
-                        # Parse win/draw/loss stats
-                        win_stats = parts[7].strip()
-                        if win_stats:
-                            # Format: "352  2  303  53.6"
-                            stats_parts = win_stats.split()
-                            if len(stats_parts) >= 4:
-                                metrics['winning_trades'] = int(stats_parts[0])
-                                # Draw trades at index 1
-                                metrics['losing_trades'] = int(stats_parts[2])
-                                metrics['win_rate'] = float(stats_parts[3])
-                        
-                    except Exception as e:
-                        logger.debug(f"Error parsing strategy summary line: {e}")
-                        pass
-            
-            # Parse backtest date range
-            if 'Backtested' in line and '->' in line:
+            parts = [part.strip() for part in line.split('│')] if strategy_name in line else []
+            if len(parts) >= 9:
                 try:
-                    # Format: "Backtested 2024-01-01 00:00:00 -> 2024-03-31 00:00:00"
-                    date_part = line.split('Backtested')[1].split('|')[0].strip()
-                    if '->' in date_part:
-                        start_date, end_date = date_part.split('->')
-                        metrics['backtest_start'] = start_date.strip()
-                        metrics['backtest_end'] = end_date.strip()
-                except:
+                    # Strategy table format: '' | Strategy | Trades | Avg Profit % | Tot Profit USDT | Tot Profit % | Avg Duration | Win Draw Loss Win% | Drawdown | ''
+                    # Note: parts[0] and parts[-1] are empty strings
+                    metrics['total_trades'] = int(parts[2])
+                    metrics['avg_profit'] = float(parts[3])
+                    
+                    # Parse total profit USDT
+                    metrics['total_profit_abs'] = float(parts[4])
+                    
+                    # Parse total profit %
+                    metrics['total_profit_percent'] = float(parts[5])
+                    
+                    # Parse duration
+                    metrics['avg_duration'] = parts[6]
+                    
+                    # Parse win/draw/loss stats
+                    win_stats = parts[7].strip()
+                    if win_stats:
+                        # Format: "352  2  303  53.6"
+                        stats_parts = win_stats.split()
+                        if len(stats_parts) >= 4:
+                            metrics['winning_trades'] = int(stats_parts[0])
+                            # Draw trades at index 1
+                            metrics['losing_trades'] = int(stats_parts[2])
+                            metrics['win_rate'] = float(stats_parts[3])
+                    
+                except Exception as e:
+                    logger.debug(f"Error parsing strategy summary line: {e}")
                     pass
         
-        return metrics
-    
+        # Parse backtest date range
+        if 'Backtested' in line and '->' in line:
+            try:
+                # Format: "Backtested 2024-01-01 00:00:00 -> 2024-03-31 00:00:00"
+                date_part = line.split('Backtested')[1].split('|')[0].strip()
+                if '->' in date_part:
+                    start_date, end_date = date_part.split('->')
+                    metrics['backtest_start'] = start_date.strip()
+                    metrics['backtest_end'] = end_date.strip()
+            except:
+                pass
+
     def get_freqtrade_version(self) -> str:
-        """Get freqtrade version."""
+        """Get freqtrade version (cached after the first probe)."""
+        if self._freqtrade_version is None:
+            self._freqtrade_version = self._probe_freqtrade_version()
+        return self._freqtrade_version
+    
+    def _probe_freqtrade_version(self) -> str:
+        """Query the installed freqtrade version."""
         try:
             result = subprocess.run(['freqtrade', '--version'], capture_output=True, text=True, timeout=10)
             if result.returncode == 0:
@@ -631,18 +1152,19 @@ class StrategyBacktester:
         try:
             if strategy_dir.exists():
                 # Check if directory is empty or contains only partial/failed files
-                files_in_dir = list(strategy_dir.iterdir())
+                with os.scandir(strategy_dir) as it:
+                    entries_in_dir = list(it)
                 
                 # Remove the directory if it's empty or contains only partial files
-                if not files_in_dir:
+                if not entries_in_dir:
                     # Directory is empty, remove it
                     strategy_dir.rmdir()
                     logger.info(f"🧹 Removed empty directory for failed strategy: {strategy_name}")
                 else:
                     # Check if it only contains partial files (no complete backtest results)
                     has_complete_results = any(
-                        f.suffix == '.json' and 'backtest' in f.name and f.stat().st_size > 1000
-                        for f in files_in_dir if f.is_file()
+                        entry.name.endswith('.json') and 'backtest' in entry.name and entry.stat().st_size > 1000
+                        for entry in entries_in_dir if entry.is_file()
                     )
                     
                     if not has_complete_results:
@@ -661,94 +1183,159 @@ class StrategyBacktester:
             return
         
         try:
+            with os.scandir(self.results_dir) as entries:
+                candidates = [entry for entry in entries
+                              if entry.name != 'individual_results' and entry.is_dir(follow_symlinks=False)]
+            
             empty_dirs = []
-            for item in self.results_dir.iterdir():
-                if item.is_dir() and item.name not in ['individual_results']:
-                    # Check if directory is empty
-                    try:
-                        if not any(item.iterdir()):
-                            empty_dirs.append(item)
-                    except:
-                        pass  # Skip if we can't read the directory
+            for entry in candidates:
+                # Check if directory is empty
+                try:
+                    with os.scandir(entry.path) as sub_entries:
+                        if next(sub_entries, None) is None:
+                            empty_dirs.append(entry)
+                except OSError:
+                    pass  # Skip if we can't read the directory
             
             if empty_dirs:
                 logger.info(f"🧹 Cleaning up {len(empty_dirs)} empty directories...")
-                for empty_dir in empty_dirs:
-                    try:
-                        empty_dir.rmdir()
-                        logger.debug(f"Removed empty directory: {empty_dir.name}")
-                    except Exception as e:
-                        logger.warning(f"Could not remove empty directory {empty_dir.name}: {e}")
-                logger.info(f"✅ Cleaned up {len(empty_dirs)} empty directories")
+                # rmdir releases the GIL, so slow (e.g. network) filesystems can overlap removals
+                with concurrent.futures.ThreadPoolExecutor(max_workers=self.cleanup_workers) as executor:
+                    removed_count = sum(executor.map(self._remove_empty_directory, empty_dirs))
+                logger.info(f"✅ Cleaned up {removed_count} empty directories")
             else:
                 logger.debug("No empty directories found to clean up")
                 
         except Exception as e:
             logger.warning(f"Error during directory cleanup: {e}")
     
+    def _remove_empty_directory(self, empty_dir: os.DirEntry) -> bool:
+        """Remove one empty results directory, returning whether it was removed."""
+        try:
+            os.rmdir(empty_dir.path)
+            logger.debug("Removed empty directory: %s", empty_dir.name)
+            return True
+        except Exception as e:
+            logger.warning(f"Could not remove empty directory {empty_dir.name}: {e}")
+            return False
+    
+    def get_results_mtime(self) -> Tuple[int, int]:
+        """Modification times of the results directories; they change whenever a result is added or replaced."""
+        return (os.stat(self.results_dir).st_mtime_ns, os.stat(self.individual_results_dir).st_mtime_ns)
+    
     def collect_all_results(self):
         """Collect all existing results from files."""
-        # Import here to avoid circular imports
-        import sys
-        import os
-        
-        # Add current directory to path so we can import utils
-        current_dir = os.path.dirname(os.path.abspath(__file__))
-        if current_dir not in sys.path:
-            sys.path.insert(0, current_dir)
+        # Skip the reload if no result has been written since the last one
+        try:
+            results_mtime = self.get_results_mtime()
+        except OSError:
+            results_mtime = None
+        if results_mtime is not None and results_mtime == self._results_cache_mtime:
+            logger.debug("Results directory unchanged, keeping loaded results")
+            return
+        self._results_cache_mtime = results_mtime
         
         try:
-            import utils
+            if self._utils is None:
+                raise ImportError("shared utils are unavailable")
             # Use shared utilities for comprehensive result detection
-            utils_instance = utils.StrategyResultsUtils(str(self.results_dir))
-            self.results, self.failed_strategies = utils_instance.collect_all_results()
+            self.results, self.failed_strategies = self._utils.collect_all_results()
             logger.info(f"Loaded {len(self.results)} successful and {len(self.failed_strategies)} failed results using shared utils")
         except Exception as e:
             logger.warning(f"Failed to use shared utils for result collection, falling back: {e}")
-            # Fallback to the old method
-            self.results = {}
-            self.failed_strategies = []
+            # Fallback to the old method; build the results once from pairs rather than key by key
+            result_items = []
+            failed_results = []
             
-            if not self.individual_results_dir.exists():
-                return
-            
-            # Load successful results
-            for result_file in self.individual_results_dir.glob("*_result.json"):
-                try:
-                    with open(result_file, 'r') as f:
-                        result = json.load(f)
-                        strategy_name = result.get('strategy', result_file.stem.replace('_result', ''))
-                        self.results[strategy_name] = result
-                        logger.debug(f"Loaded existing result for {strategy_name}")
-                except Exception as e:
-                    logger.warning(f"Could not load result from {result_file}: {e}")
-            
-            # Load failed results
-            for failed_file in self.individual_results_dir.glob("*_failed.json"):
-                try:
-                    with open(failed_file, 'r') as f:
-                        failed_result = json.load(f)
-                        self.failed_strategies.append(failed_result)
-                        logger.debug(f"Loaded failed result for {failed_result.get('strategy', 'unknown')}")
-                except Exception as e:
-                    logger.warning(f"Could not load failed result from {failed_file}: {e}")
+            if self.individual_results_dir.exists():
+                # Load successful and failed results in a single directory pass
+                result_entries = self._scan_results_dir()
+                
+                # Only parse files that are new or changed since the last load
+                parsed_files = self._parsed_result_files
+                stale_paths = [path for _, path, _, mtime_ns in result_entries
+                               if parsed_files.get(path, (None,))[0] != mtime_ns]
+                
+                # Reads release the GIL, so keep many of them outstanding on a thread pool and merge here
+                load_workers = max(1, min(self.result_load_workers, len(stale_paths)))
+                with concurrent.futures.ThreadPoolExecutor(max_workers=load_workers) as executor:
+                    loaded = dict(zip(stale_paths, executor.map(self._load_result_file, stale_paths)))
+                
+                # Rebuild the cache from the current listing so removed files are dropped
+                self._parsed_result_files = {}
+                for file_name, path, kind, mtime_ns in result_entries:
+                    if path in loaded:
+                        data = loaded[path]
+                        if data is None:
+                            continue
+                        self._parsed_result_files[path] = (mtime_ns, data)
+                    else:
+                        data = parsed_files[path][1]
+                        self._parsed_result_files[path] = parsed_files[path]
+                    
+                    if kind == 'result':
+                        strategy_name = data.get('strategy', file_name.removesuffix(RESULT_FILE_SUFFIX))
+                        result_items.append((strategy_name, data))
+                        logger.debug("Loaded existing result for %s", strategy_name)
+                    else:
+                        failed_results.append(data)
+                        logger.debug("Loaded failed result for %s", data.get('strategy', 'unknown'))
             
+            self.results = dict(result_items)
+            self.failed_strategies = failed_results
             logger.info(f"Loaded {len(self.results)} successful and {len(self.failed_strategies)} failed results from previous runs")
+        
+        self._update_result_name_sets()
+    
+    def merge_batch_results(self, completed_results: Dict[str, Dict], failed_results: List[Dict]):
+        """Merge one batch's outcomes into the loaded results without rescanning the results directory."""
+        self.results.update(completed_results)
+        newly_failed = {fs.get('strategy') for fs in failed_results}
+        self.failed_strategies = [fs for fs in self.failed_strategies if fs.get('strategy') not in newly_failed]
+        self.failed_strategies.extend(failed_results)
+        self._update_result_name_sets()
+        self.flush_result_index()
+    
+    def _update_result_name_sets(self):
+        """Rebuild the completed/failed strategy name sets from the loaded results."""
+        self._results_name_set = set(self.results)
+        self._failed_name_set = {fs.get('strategy') for fs in self.failed_strategies}
+    
+    def _scan_results_dir(self) -> List[Tuple[str, str, str, int]]:
+        """
+        List the individual result files with their modification times.
+        
+        Returns:
+            List of (file_name, path, kind, mtime_ns) where kind is 'result' or 'failed'
+        """
+        scanned = []
+        with os.scandir(self.individual_results_dir) as entries:
+            for entry in entries:
+                if entry.name.endswith(RESULT_FILE_SUFFIX):
+                    kind = 'result'
+                elif entry.name.endswith(FAILED_FILE_SUFFIX):
+                    kind = 'failed'
+                else:
+                    continue
+                # is_file() answers from the cached directory entry type
+                if entry.is_file(follow_symlinks=False):
+                    scanned.append((entry.name, entry.path, kind, entry.stat(follow_symlinks=False).st_mtime_ns))
+        return scanned
+    
+    def _load_result_file(self, path: str) -> Optional[Dict]:
+        """Parse one individual result file, returning None if it can't be read."""
+        try:
+            return load_json_file(path)
+        except Exception as e:
+            logger.warning(f"Could not load result from {path}: {e}")
+            return None
     
     def get_previously_successful_strategies(self) -> List[str]:
         """Get list of strategies that were previously successful."""
-        # Import here to avoid circular imports
-        import sys
-        import os
-        
-        # Add current directory to path so we can import utils
-        current_dir = os.path.dirname(os.path.abspath(__file__))
-        if current_dir not in sys.path:
-            sys.path.insert(0, current_dir)
-        
         try:
-            import utils
-            successful_strategies = utils.discover_successful_strategies(str(self.results_dir))
+            if self._utils is None:
+                raise ImportError("shared utils are unavailable")
+            successful_strategies, _ = self._utils.discover_all_successful_strategies()
             logger.info(f"Found {len(successful_strategies)} previously successful strategies using shared utils")
             return successful_strategies
         except Exception as e:
@@ -760,22 +1347,20 @@ class StrategyBacktester:
                 logger.warning("No individual results directory found. Run some backtests first.")
                 return []
             
-            # Find all successful result files
-            for result_file in self.individual_results_dir.glob("*_result.json"):
-                try:
-                    strategy_name = result_file.stem.replace('_result', '')
+            # Find all successful result files among the names listed at startup and saved since
+            for file_name in self._result_file_names:
+                if file_name.endswith(RESULT_FILE_SUFFIX):
+                    strategy_name = file_name.removesuffix(RESULT_FILE_SUFFIX)
                     successful_strategies.append(strategy_name)
-                    logger.debug(f"Found successful strategy: {strategy_name}")
-                except Exception as e:
-                    logger.warning(f"Could not parse result file {result_file}: {e}")
+                    logger.debug("Found successful strategy: %s", strategy_name)
             
             logger.info(f"Found {len(successful_strategies)} previously successful strategies")
             return sorted(successful_strategies)
     
     def get_strategies_to_process(self, all_strategies: List[str], include_failed: bool = True) -> List[str]:
         """Get list of strategies that need to be processed (pending or optionally failed)."""
-        already_completed = set(self.results.keys())
-        already_failed = {fs.get('strategy') for fs in self.failed_strategies}
+        already_completed = self._results_name_set
+        already_failed = self._failed_name_set
         
         # Start with pending strategies
         pending_strategies = [s for s in all_strategies if s not in already_completed and s not in already_failed]
@@ -829,39 +1414,37 @@ class StrategyBacktester:
         total_strategies = len(strategies)
         logger.info(f"Starting batch processing of {total_strategies} strategies...")
         
-        # Use parallel processing (workers=1 provides sequential behavior)
-        if len(strategies) > 1 and self.max_workers > 1:
-            # Use parallel processing with multiple workers
-            start_time = time.time()
-            results = self.run_parallel_backtests(strategies)
-            end_time = time.time()
-            
-            logger.info(f"🚀 Parallel processing completed in {end_time - start_time:.1f}s")
-            logger.info(f"Average time per strategy: {(end_time - start_time) / len(strategies):.1f}s")
-            
-        else:
-            # Use sequential processing (single worker or single strategy)
-            if self.max_workers == 1:
-                logger.info("Using sequential processing (1 worker)...")
-            else:
-                logger.info("Using sequential processing (single strategy)...")
-                
+        if self.in_process:
+            # The freqtrade Python API runs one backtest at a time in this process
+            logger.info("Using sequential in-process freqtrade backtesting...")
+            completed_results = {}
+            failed_results = []
             for i, strategy in enumerate(strategies, 1):
-                logger.info(f"📊 Progress: {i}/{total_strategies} ({(i/total_strategies)*100:.1f}%) - Processing {strategy}")
+                logger.info("📊 Progress: %d/%d (%.1f%%) - Processing %s", i, total_strategies, i * 100.0 / total_strategies, strategy)
                 
-                result = self.run_backtest_worker(strategy)
+                result = self.run_backtest_in_process(strategy)
                 if result:
-                    self.results[strategy] = result
+                    completed_results[strategy] = result
                     logger.info(f"✅ Successfully completed {strategy}")
                 else:
+                    failed_results.append(self.take_saved_failure(strategy))
                     logger.info(f"❌ Failed to complete {strategy}")
+            self.merge_batch_results(completed_results, failed_results)
         
-        # Final summary
-        self.collect_all_results()  # Reload to get latest counts
+        else:
+            # Subprocess backtests always go through the parallel runner (workers=1 provides sequential behavior)
+            start_time = time.time()
+            results = self.run_parallel_backtests(strategies)
+            end_time = time.time()
+            
+            logger.info(f"🚀 Parallel processing completed in {end_time - start_time:.1f}s")
+            logger.info(f"Average time per strategy: {(end_time - start_time) / len(strategies):.1f}s")
+        
+        # Final summary; the batch outcomes were merged in as they finished, so no reload is needed
         logger.info(f"🏁 Batch completed! Total successful: {len(self.results)}, Total failed: {len(self.failed_strategies)}")
         
-        # Check if there are more strategies to process
-        if strategies is None or len(strategies) >= max_strategies if max_strategies else True:
+        # Check if there are more strategies to process (only reported, so skip it when INFO is off)
+        if (max_strategies is None or len(strategies) >= max_strategies) and logger.isEnabledFor(logging.INFO):
             remaining_strategies = self.get_strategies_to_process(self.discover_strategies(), include_failed=False)
             if remaining_strategies:
                 logger.info(f"📋 {len(remaining_strategies)} strategies still pending for future runs")
@@ -876,19 +1459,17 @@ class StrategyBacktester:
     
     def save_intermediate_results(self):
         """Save intermediate results to prevent data loss."""
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        timestamp = time.strftime("%Y%m%d_%H%M%S")
         
         # Save successful results
         if self.results:
-            results_file = self.results_dir / f"intermediate_results_{timestamp}.json"
-            with open(results_file, 'w') as f:
-                json.dump(self.results, f, indent=2)
+            results_file = os.path.join(self._results_dir_str, f"intermediate_results_{timestamp}.json")
+            self.write_json_atomic(results_file, self.results, indent=True)
         
         # Save failed strategies
         if self.failed_strategies:
-            failed_file = self.results_dir / f"failed_strategies_{timestamp}.json"
-            with open(failed_file, 'w') as f:
-                json.dump(self.failed_strategies, f, indent=2)
+            failed_file = os.path.join(self._results_dir_str, f"failed_strategies_{timestamp}.json")
+            self.write_json_atomic(failed_file, self.failed_strategies, indent=True)
 
 
 def main():
@@ -900,11 +1481,12 @@ def main():
     parser.add_argument('--continuous', action='store_true', help='Run continuously until all strategies are processed')
     parser.add_argument('--compatible-only', action='store_true', help='Only test strategies compatible with current freqtrade version')
     parser.add_argument('--successful-only', action='store_true', help='Only test strategies that were previously successful')
-    parser.add_argument('--workers', type=int, default=None, help='Number of workers for parallel processing (1 = sequential)')
+    parser.add_argument('--workers', type=int, default=None, help='Number of workers for parallel processing (1 = sequential, default: adaptive to memory usage)')
+    parser.add_argument('--in-process', action='store_true', help='Backtest sequentially through the freqtrade Python API instead of one freqtrade process per strategy (no per-strategy timeout)')
     
     args = parser.parse_args()
     
-    backtester = StrategyBacktester(args.config, args.workers)
+    backtester = StrategyBacktester(args.config, args.workers, in_process=args.in_process)
     
     try:
         if args.strategy:
@@ -917,6 +1499,9 @@ def main():
                 logger.info("🚀 Starting continuous backtesting mode...")
                 logger.info("Will process all pending/failed strategies until completion")
                 
+                # The strategy catalog doesn't change between batches, so discover it once
+                all_strategies = backtester.discover_strategies(compatible_only=args.compatible_only)
+                
                 batch_count = 0
                 while True:
                     batch_count += 1
@@ -924,7 +1509,6 @@ def main():
                     
                     # Load current state
                     backtester.collect_all_results()
-                    all_strategies = backtester.discover_strategies(compatible_only=args.compatible_only)
                     
                     if not all_strategies:
                         logger.error("No strategies discovered!")
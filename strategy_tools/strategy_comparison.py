@@ -5,11 +5,12 @@ This script crawls existing backtest results and generates comparison reports.
 """
 
 import json
+import numpy as np
 import pandas as pd
 import argparse
 from datetime import datetime
 from pathlib import Path
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Sequence
 import logging
 import zipfile
 import tempfile
@@ -22,6 +23,12 @@ if current_dir not in sys.path:
     sys.path.insert(0, current_dir)
 import utils
 
+# orjson encodes indented JSON in native code; fall back to stdlib json if missing
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 # Configure logging
 logging.basicConfig(
     level=logging.INFO,
@@ -37,10 +44,11 @@ class StrategyComparison:
         self.results_dir = Path(results_dir)
         self.individual_results_dir = self.results_dir / "individual_results"
         self.results = {}
+        self._results_list = ()  # Snapshot of self.results.values(), rebuilt on collect
         self.failed_strategies = []
         
-        # Initialize shared utilities
-        self.utils = utils.StrategyResultsUtils(results_dir)
+        # Initialize shared utilities; backtest JSON parsing is CPU bound, so spread it over processes
+        self.utils = utils.StrategyResultsUtils(results_dir, process_workers=os.cpu_count())
         
 
     
@@ -48,18 +56,22 @@ class StrategyComparison:
         """Collect all existing results from strategy directories."""
         # Use shared utilities for consistent result detection
         self.results, self.failed_strategies = self.utils.collect_all_results()
+        self._results_list = tuple(self.results.values())
     
-    def generate_comparison_report(self, top_n: int = 20):
+    def generate_comparison_report(self, top_n: int = 20, output_format: str = 'csv'):
         """Generate a comprehensive comparison report."""
         if not self.results:
             logger.error("❌ No successful results found to compare!")
             return
         
-        # Convert results to DataFrame for easier analysis
-        df = pd.DataFrame(list(self.results.values()))
+        # Rank by total profit percentage (descending) with one sort over a single column
+        sorted_results = self.sort_by_profit(self._results_list)
+        
+        # Column-wise DataFrame for the CSV export and summary statistics
+        df = pd.DataFrame.from_records(sorted_results)
         
-        # Sort by total profit percentage (descending)
-        df = df.sort_values('total_profit_percent', ascending=False)
+        # Read the profit column once; both summaries reduce over it
+        profits = df['total_profit_percent'].to_numpy(dtype=np.float64)
         
         # Generate timestamp for report
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
@@ -67,134 +79,159 @@ class StrategyComparison:
         # Ensure results directory exists
         self.results_dir.mkdir(parents=True, exist_ok=True)
         
-        # 1. Save detailed CSV report
-        csv_file = self.results_dir / f"strategy_comparison_{timestamp}.csv"
-        df.to_csv(csv_file, index=False)
-        logger.info(f"📄 Detailed CSV report saved: {csv_file}")
+        # 1. Save detailed report table (CSV by default, feather/parquet via pyarrow)
+        table_file = utils.save_dataframe(df, self.results_dir / f"strategy_comparison_{timestamp}.csv", output_format)
+        logger.info(f"📄 Detailed {output_format.upper()} report saved: {table_file}")
         
         # 2. Generate summary report
-        self.generate_summary_report(df, timestamp)
+        self.generate_summary_report(df, timestamp, profits)
         
         # 3. Generate top performers report
-        self.generate_top_performers_report(df, timestamp, top_n)
+        self.generate_top_performers_report(sorted_results, timestamp, top_n)
         
         # 4. Save failed strategies report
         if self.failed_strategies:
             failed_file = self.results_dir / f"failed_strategies_{timestamp}.json"
-            with open(failed_file, 'w') as f:
-                json.dump(self.failed_strategies, f, indent=2)
+            # Serialize once and write the whole report in a single call
+            if orjson:
+                failed_file.write_bytes(orjson.dumps(self.failed_strategies, option=orjson.OPT_INDENT_2))
+            else:
+                failed_file.write_text(json.dumps(self.failed_strategies, indent=2))
             logger.info(f"❌ Failed strategies report saved: {failed_file}")
         
         logger.info(f"✅ All reports generated in: {self.results_dir}")
         
         # Display top performers summary
-        self.display_top_performers_summary(df, top_n)
+        self.display_top_performers_summary(sorted_results, top_n, profits)
+    
+    def sort_by_profit(self, results: Sequence[Dict]) -> List[Dict]:
+        """Sort result dicts by total profit percentage, best first (missing profits last)."""
+        profits = np.fromiter(
+            (np.nan if r.get('total_profit_percent') is None else r['total_profit_percent'] for r in results),
+            dtype=np.float64, count=len(results)
+        )
+        order = np.argsort(-profits, kind='stable')
+        return [results[i] for i in order]
     
-    def generate_summary_report(self, df: pd.DataFrame, timestamp: str):
+    def generate_summary_report(self, df: pd.DataFrame, timestamp: str, profits: Optional[np.ndarray] = None):
         """Generate a summary statistics report."""
         summary_file = self.results_dir / f"summary_report_{timestamp}.txt"
         
         # Get backtest configuration from first result
-        first_result = list(self.results.values())[0] if self.results else {}
+        first_result = self._results_list[0] if self._results_list else {}
         start_date = first_result.get('backtest_start', 'Unknown')
         end_date = first_result.get('backtest_end', 'Unknown')
         
-        with open(summary_file, 'w') as f:
-            f.write("FREQTRADE STRATEGY BACKTESTING SUMMARY REPORT\n")
-            f.write("=" * 60 + "\n\n")
-            f.write(f"Test Period: {start_date} to {end_date}\n")
-            f.write(f"Generated: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n\n")
+        # Build the report in memory and write it in one call
+        parts = []
+        parts.append("FREQTRADE STRATEGY BACKTESTING SUMMARY REPORT\n")
+        parts.append("=" * 60 + "\n\n")
+        parts.append(f"Test Period: {start_date} to {end_date}\n")
+        parts.append(f"Generated: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n\n")
+        
+        parts.append(f"OVERVIEW:\n")
+        parts.append(f"Total Strategies Tested: {len(df) + len(self.failed_strategies)}\n")
+        parts.append(f"Successful Backtests: {len(df)}\n")
+        parts.append(f"Failed Backtests: {len(self.failed_strategies)}\n")
+        parts.append(f"Success Rate: {(len(df)/(len(df) + len(self.failed_strategies)))*100:.1f}%\n\n")
+        
+        if len(df) > 0:
+            # Pull each column out once and reduce over the numpy arrays (NaN-skipping, like pandas)
+            if profits is None:
+                profits = df['total_profit_percent'].to_numpy(dtype=np.float64)
+            profitable_profits = profits[profits > 0]
+            strategies = df['strategy'].to_numpy()
+            
+            parts.append(f"PERFORMANCE STATISTICS:\n")
+            parts.append(f"Best Strategy: {strategies[0]} ({profits[0]:.2f}%)\n")
+            parts.append(f"Worst Strategy: {strategies[-1]} ({profits[-1]:.2f}%)\n")
+            parts.append(f"Average Return: {np.nanmean(profits):.2f}%\n")
+            parts.append(f"Median Return: {np.nanmedian(profits):.2f}%\n")
+            parts.append(f"Standard Deviation: {np.nanstd(profits, ddof=1) if len(profits) > 1 else np.nan:.2f}%\n\n")
+            
+            parts.append(f"PROFITABLE STRATEGIES:\n")
+            parts.append(f"Count: {len(profitable_profits)} ({(len(profitable_profits)/len(df))*100:.1f}%)\n")
+            if len(profitable_profits) > 0:
+                parts.append(f"Average Profit: {profitable_profits.mean():.2f}%\n\n")
             
-            f.write(f"OVERVIEW:\n")
-            f.write(f"Total Strategies Tested: {len(df) + len(self.failed_strategies)}\n")
-            f.write(f"Successful Backtests: {len(df)}\n")
-            f.write(f"Failed Backtests: {len(self.failed_strategies)}\n")
-            f.write(f"Success Rate: {(len(df)/(len(df) + len(self.failed_strategies)))*100:.1f}%\n\n")
+            parts.append(f"TRADING ACTIVITY:\n")
+            parts.append(f"Average Trades per Strategy: {np.nanmean(df['total_trades'].to_numpy(dtype=np.float64)):.1f}\n")
+            parts.append(f"Average Win Rate: {np.nanmean(df['win_rate'].to_numpy(dtype=np.float64)):.1f}%\n")
+            parts.append(f"Average Max Drawdown: {np.nanmean(df['max_drawdown'].to_numpy(dtype=np.float64)):.2f}%\n\n")
             
-            if len(df) > 0:
-                f.write(f"PERFORMANCE STATISTICS:\n")
-                f.write(f"Best Strategy: {df.iloc[0]['strategy']} ({df.iloc[0]['total_profit_percent']:.2f}%)\n")
-                f.write(f"Worst Strategy: {df.iloc[-1]['strategy']} ({df.iloc[-1]['total_profit_percent']:.2f}%)\n")
-                f.write(f"Average Return: {df['total_profit_percent'].mean():.2f}%\n")
-                f.write(f"Median Return: {df['total_profit_percent'].median():.2f}%\n")
-                f.write(f"Standard Deviation: {df['total_profit_percent'].std():.2f}%\n\n")
-                
-                f.write(f"PROFITABLE STRATEGIES:\n")
-                profitable = df[df['total_profit_percent'] > 0]
-                f.write(f"Count: {len(profitable)} ({(len(profitable)/len(df))*100:.1f}%)\n")
-                if len(profitable) > 0:
-                    f.write(f"Average Profit: {profitable['total_profit_percent'].mean():.2f}%\n\n")
-                
-                f.write(f"TRADING ACTIVITY:\n")
-                f.write(f"Average Trades per Strategy: {df['total_trades'].mean():.1f}\n")
-                f.write(f"Average Win Rate: {df['win_rate'].mean():.1f}%\n")
-                f.write(f"Average Max Drawdown: {df['max_drawdown'].mean():.2f}%\n\n")
-                
-                # Additional metrics if available
-                if 'sharpe_ratio' in df.columns:
-                    f.write(f"RISK METRICS:\n")
-                    f.write(f"Average Sharpe Ratio: {df['sharpe_ratio'].mean():.2f}\n")
-                    f.write(f"Average Profit Factor: {df['profit_factor'].mean():.2f}\n")
-                    if 'cagr' in df.columns:
-                        f.write(f"Average CAGR: {df['cagr'].mean():.2f}%\n")
-                    if 'sortino' in df.columns:
-                        f.write(f"Average Sortino Ratio: {df['sortino'].mean():.2f}\n")
+            # Additional metrics if available
+            if 'sharpe_ratio' in df.columns:
+                parts.append(f"RISK METRICS:\n")
+                parts.append(f"Average Sharpe Ratio: {df['sharpe_ratio'].mean():.2f}\n")
+                parts.append(f"Average Profit Factor: {df['profit_factor'].mean():.2f}\n")
+                if 'cagr' in df.columns:
+                    parts.append(f"Average CAGR: {df['cagr'].mean():.2f}%\n")
+                if 'sortino' in df.columns:
+                    parts.append(f"Average Sortino Ratio: {df['sortino'].mean():.2f}\n")
+        
+        with open(summary_file, 'w', buffering=1 << 20) as f:
+            f.write(''.join(parts))
         
         logger.info(f"📊 Summary report saved: {summary_file}")
     
-    def generate_top_performers_report(self, df: pd.DataFrame, timestamp: str, top_n: int = 20):
+    def generate_top_performers_report(self, sorted_results: List[Dict], timestamp: str, top_n: int = 20):
         """Generate a report of top performing strategies."""
         top_file = self.results_dir / f"top_{top_n}_strategies_{timestamp}.txt"
         
-        with open(top_file, 'w') as f:
-            f.write(f"TOP {top_n} PERFORMING STRATEGIES\n")
-            f.write("=" * 50 + "\n\n")
-            
-            top_strategies = df.head(top_n)
-            
-            for i, row in top_strategies.iterrows():
-                rank = top_strategies.index.get_loc(i) + 1
-                f.write(f"#{rank:2d}. {row['strategy']}\n")
-                f.write(f"     Total Return: {row['total_profit_percent']:8.2f}%\n")
-                f.write(f"     Total Trades: {row['total_trades']:8.0f}\n")
-                f.write(f"     Win Rate:     {row['win_rate']:8.1f}%\n")
-                f.write(f"     Max Drawdown: {row['max_drawdown']:8.2f}%\n")
-                f.write(f"     Avg Duration: {row['avg_duration']}\n")
-                if row['best_pair']:
-                    f.write(f"     Best Pair:    {row['best_pair']}\n")
-                if 'sharpe_ratio' in row and row['sharpe_ratio']:
-                    f.write(f"     Sharpe Ratio: {row['sharpe_ratio']:8.2f}\n")
-                if 'profit_factor' in row and row['profit_factor']:
-                    f.write(f"     Profit Factor:{row['profit_factor']:8.2f}\n")
-                f.write("\n")
+        # Build the report in memory and write it in one call
+        parts = []
+        parts.append(f"TOP {top_n} PERFORMING STRATEGIES\n")
+        parts.append("=" * 50 + "\n\n")
+        
+        top_strategies = sorted_results[:top_n]
+        
+        for rank, row in enumerate(top_strategies, 1):
+            parts.append(f"#{rank:2d}. {row['strategy']}\n")
+            parts.append(f"     Total Return: {row['total_profit_percent']:8.2f}%\n")
+            parts.append(f"     Total Trades: {row['total_trades']:8.0f}\n")
+            parts.append(f"     Win Rate:     {row['win_rate']:8.1f}%\n")
+            parts.append(f"     Max Drawdown: {row['max_drawdown']:8.2f}%\n")
+            parts.append(f"     Avg Duration: {row['avg_duration']}\n")
+            if row['best_pair']:
+                parts.append(f"     Best Pair:    {row['best_pair']}\n")
+            if 'sharpe_ratio' in row and row['sharpe_ratio']:
+                parts.append(f"     Sharpe Ratio: {row['sharpe_ratio']:8.2f}\n")
+            if 'profit_factor' in row and row['profit_factor']:
+                parts.append(f"     Profit Factor:{row['profit_factor']:8.2f}\n")
+            parts.append("\n")
+        
+        with open(top_file, 'w', buffering=1 << 20) as f:
+            f.write(''.join(parts))
         
         logger.info(f"🏆 Top performers report saved: {top_file}")
     
-    def display_top_performers_summary(self, df: pd.DataFrame, top_n: int):
+    def display_top_performers_summary(self, sorted_results: List[Dict], top_n: int,
+                                       profits: Optional[np.ndarray] = None):
         """Display a summary of top performers in the console."""
         print(f"\n🏆 TOP {top_n} PERFORMING STRATEGIES")
         print("=" * 80)
         
-        top_strategies = df.head(top_n)
+        top_strategies = sorted_results[:top_n]
         
         # Display table header
         print(f"{'Rank':<4} {'Strategy':<25} {'Return':<8} {'Trades':<7} {'Win Rate':<8} {'Max DD':<8} {'Sharpe':<7}")
         print("-" * 80)
         
-        for i, row in top_strategies.iterrows():
-            rank = top_strategies.index.get_loc(i) + 1
+        for rank, row in enumerate(top_strategies, 1):
             strategy_name = row['strategy'][:24]  # Truncate long names
             sharpe_str = f"{row['sharpe_ratio']:6.2f}" if row.get('sharpe_ratio') else "  N/A"
             print(f"{rank:<4} {strategy_name:<25} {row['total_profit_percent']:>6.2f}% {row['total_trades']:>6.0f} {row['win_rate']:>6.1f}% {row['max_drawdown']:>6.2f}% {sharpe_str}")
         
         print("\n📊 SUMMARY STATISTICS")
         print("-" * 30)
-        profitable = df[df['total_profit_percent'] > 0]
-        print(f"Total strategies analyzed: {len(df)}")
-        print(f"Profitable strategies: {len(profitable)} ({(len(profitable)/len(df))*100:.1f}%)")
-        print(f"Average return: {df['total_profit_percent'].mean():.2f}%")
-        print(f"Best performer: {df.iloc[0]['strategy']} ({df.iloc[0]['total_profit_percent']:.2f}%)")
-        print(f"Worst performer: {df.iloc[-1]['strategy']} ({df.iloc[-1]['total_profit_percent']:.2f}%)")
+        if profits is None:
+            profits = np.array([row['total_profit_percent'] for row in sorted_results], dtype=np.float64)
+        profitable_count = int((profits > 0).sum())
+        print(f"Total strategies analyzed: {len(sorted_results)}")
+        print(f"Profitable strategies: {profitable_count} ({(profitable_count/len(sorted_results))*100:.1f}%)")
+        print(f"Average return: {np.nanmean(profits):.2f}%")
+        print(f"Best performer: {sorted_results[0]['strategy']} ({sorted_results[0]['total_profit_percent']:.2f}%)")
+        print(f"Worst performer: {sorted_results[-1]['strategy']} ({sorted_results[-1]['total_profit_percent']:.2f}%)")
         
         if self.failed_strategies:
             print(f"\n❌ Failed strategies: {len(self.failed_strategies)}")
@@ -207,34 +244,37 @@ class StrategyComparison:
             logger.error("❌ No results found to filter!")
             return
         
-        df = pd.DataFrame(list(self.results.values()))
-        filtered_df = df.copy()
+        df = pd.DataFrame.from_records(self._results_list)
         
+        # Apply every criterion to one boolean mask, then select the matching rows once
+        mask = np.ones(len(df), dtype=bool)
         criteria = []
         if min_return is not None:
-            filtered_df = filtered_df[filtered_df['total_profit_percent'] >= min_return]
+            mask &= df['total_profit_percent'].to_numpy() >= min_return
             criteria.append(f"return >= {min_return}%")
         
         if min_trades is not None:
-            filtered_df = filtered_df[filtered_df['total_trades'] >= min_trades]
+            mask &= df['total_trades'].to_numpy() >= min_trades
             criteria.append(f"trades >= {min_trades}")
         
         if max_drawdown is not None:
-            filtered_df = filtered_df[filtered_df['max_drawdown'] <= max_drawdown]
+            mask &= df['max_drawdown'].to_numpy() <= max_drawdown
             criteria.append(f"max_drawdown <= {max_drawdown}%")
         
         if min_win_rate is not None:
-            filtered_df = filtered_df[filtered_df['win_rate'] >= min_win_rate]
+            mask &= df['win_rate'].to_numpy() >= min_win_rate
             criteria.append(f"win_rate >= {min_win_rate}%")
         
-        if min_sharpe is not None and 'sharpe_ratio' in filtered_df.columns:
-            filtered_df = filtered_df[filtered_df['sharpe_ratio'] >= min_sharpe]
+        if min_sharpe is not None and 'sharpe_ratio' in df.columns:
+            mask &= df['sharpe_ratio'].to_numpy() >= min_sharpe
             criteria.append(f"sharpe >= {min_sharpe}")
         
-        if min_profit_factor is not None and 'profit_factor' in filtered_df.columns:
-            filtered_df = filtered_df[filtered_df['profit_factor'] >= min_profit_factor]
+        if min_profit_factor is not None and 'profit_factor' in df.columns:
+            mask &= df['profit_factor'].to_numpy() >= min_profit_factor
             criteria.append(f"profit_factor >= {min_profit_factor}")
         
+        filtered_df = df.iloc[np.flatnonzero(mask)]
+        
         # Sort by return
         filtered_df = filtered_df.sort_values('total_profit_percent', ascending=False)
         
@@ -249,10 +289,12 @@ class StrategyComparison:
         print(f"{'Strategy':<25} {'Return':<8} {'Trades':<7} {'Win Rate':<8} {'Max DD':<8} {'Sharpe':<7}")
         print("-" * 80)
         
-        for _, row in filtered_df.iterrows():
-            strategy_name = row['strategy'][:24]
-            sharpe_str = f"{row['sharpe_ratio']:6.2f}" if row.get('sharpe_ratio') else "  N/A"
-            print(f"{strategy_name:<25} {row['total_profit_percent']:>6.2f}% {row['total_trades']:>6.0f} {row['win_rate']:>6.1f}% {row['max_drawdown']:>6.2f}% {sharpe_str}")
+        # itertuples yields plain namedtuples instead of boxing every row into a Series
+        for row in filtered_df.itertuples(index=False):
+            strategy_name = row.strategy[:24]
+            sharpe_ratio = getattr(row, 'sharpe_ratio', None)
+            sharpe_str = f"{sharpe_ratio:6.2f}" if sharpe_ratio else "  N/A"
+            print(f"{strategy_name:<25} {row.total_profit_percent:>6.2f}% {row.total_trades:>6.0f} {row.win_rate:>6.1f}% {row.max_drawdown:>6.2f}% {sharpe_str}")
 
 def main():
     parser = argparse.ArgumentParser(description='Strategy Comparison Tool - Analyze backtest results')
@@ -268,6 +310,8 @@ def main():
     parser.add_argument('--min-profit-factor', type=float, help='Minimum profit factor filter')
     parser.add_argument('--filter-only', action='store_true', 
                        help='Only show filtered results, skip generating reports')
+    parser.add_argument('--format', choices=utils.REPORT_FORMATS, default='csv',
+                       help='Detailed report table format (default: csv; feather/parquet require pyarrow)')
     
     args = parser.parse_args()
     
@@ -300,7 +344,7 @@ def main():
                 return
         
         # Generate comparison reports
-        comparison.generate_comparison_report(args.num_strategies)
+        comparison.generate_comparison_report(args.num_strategies, output_format=args.format)
         
     except Exception as e:
         logger.error(f"💥 Error: {e}")
@@ -4,89 +4,215 @@ Strategy Backtest Status Checker
 Shows which strategies have been completed, failed, or are pending.
 """
 
+import os
+import sys
+import csv
 import json
+import heapq
+import pickle
+import argparse
 from pathlib import Path
 from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor
 import pandas as pd
 
+# Import shared utilities
+current_dir = os.path.dirname(os.path.abspath(__file__))
+if current_dir not in sys.path:
+    sys.path.insert(0, current_dir)
+import utils
+
+# orjson parses straight from bytes; fall back to stdlib json if missing
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Top-level fields the status entries read; only these are kept from a parsed result file
+RESULT_STATUS_KEYS = ('total_profit_percent', 'total_trades', 'win_rate', 'max_drawdown',
+                      'execution_time', 'backtest_timestamp', 'backtest_config')
+FAILED_STATUS_KEYS = ('error', 'failed_timestamp', 'backtest_config')
+
+def json_loads(data: bytes):
+    """Parse JSON bytes, using orjson when available."""
+    return orjson.loads(data) if orjson else json.loads(data)
+
+def load_status_fields(path, keys):
+    """Load only the given top-level keys from a JSON object file."""
+    with open(path, 'rb') as f:
+        data = json_loads(f.read())
+    return {key: data[key] for key in keys if key in data}
+
 class StrategyStatusChecker:
     def __init__(self):
         self.results_dir = Path("user_data/backtest_results")
         self.individual_results_dir = self.results_dir / "individual_results"
+        # Parsed status entries keyed on result file path, mtime and size
+        self.status_cache_file = self.results_dir / ".status_cache.pkl"
         
     def discover_all_strategies(self):
         """Discover all available strategies."""
         strategies_dir = Path("user_data/strategies")
         strategies = []
         
-        for strategy_dir in strategies_dir.iterdir():
-            if strategy_dir.is_dir() and not strategy_dir.name.startswith('.'):
-                py_files = list(strategy_dir.glob("*.py"))
-                if py_files:
-                    strategies.append(strategy_dir.name)
+        with os.scandir(strategies_dir) as entries:
+            for strategy_dir in entries:
+                if strategy_dir.name.startswith('.') or not strategy_dir.is_dir(follow_symlinks=False):
+                    continue
+                # Stop at the first Python file instead of listing them all
+                with os.scandir(strategy_dir.path) as files:
+                    if any(f.name.endswith('.py') and f.is_file() for f in files):
+                        strategies.append(strategy_dir.name)
         
         return sorted(strategies)
     
+    def load_status_cache(self):
+        """Load cached status entries: file path -> (mtime_ns, size, status entry)."""
+        try:
+            with open(self.status_cache_file, 'rb') as f:
+                cache = pickle.load(f)
+            return cache if isinstance(cache, dict) else {}
+        except FileNotFoundError:
+            return {}
+        except Exception:
+            return {}  # Unreadable or stale format, rebuild it
+    
+    def save_status_cache(self, cache):
+        """Write the status cache atomically."""
+        try:
+            tmp_file = self.status_cache_file.with_suffix('.pkl.tmp')
+            with open(tmp_file, 'wb') as f:
+                pickle.dump(cache, f, protocol=5)
+            os.replace(tmp_file, self.status_cache_file)
+        except OSError:
+            pass  # The cache is only an optimization
+    
+    def scan_result_files(self):
+        """
+        Classify the individual result files with a single directory read.
+        
+        Returns:
+            Dict mapping strategy name to a (kind, DirEntry) tuple, kind being 'completed' or 'failed'
+        """
+        seen = {}
+        try:
+            with os.scandir(self.individual_results_dir) as entries:
+                for entry in entries:
+                    name = entry.name
+                    if name.endswith('_result.json'):
+                        seen[name[:-len('_result.json')]] = ('completed', entry)
+                    elif name.endswith('_failed.json'):
+                        # A result file takes precedence over a failed file
+                        seen.setdefault(name[:-len('_failed.json')], ('failed', entry))
+        except FileNotFoundError:
+            pass
+        return seen
+    
     def get_strategy_status(self):
         """Get status of all strategies."""
         all_strategies = self.discover_all_strategies()
+        cache = self.load_status_cache()
+        result_files = self.scan_result_files()
         
-        status_data = []
+        # Result reads are I/O bound, so overlap them across a thread pool
+        with ThreadPoolExecutor(max_workers=max(1, min(32, len(all_strategies)))) as executor:
+            loaded = list(executor.map(
+                lambda strategy: self.get_single_strategy_status(strategy, cache, result_files),
+                all_strategies))
         
-        for strategy in all_strategies:
-            result_file = self.individual_results_dir / f"{strategy}_result.json"
-            failed_file = self.individual_results_dir / f"{strategy}_failed.json"
-            
-            if result_file.exists():
-                try:
-                    with open(result_file, 'r') as f:
-                        result = json.load(f)
-                    
-                    status_data.append({
-                        'strategy': strategy,
-                        'status': 'completed',
-                        'total_profit_percent': result.get('total_profit_percent', 0),
-                        'total_trades': result.get('total_trades', 0),
-                        'win_rate': result.get('win_rate', 0),
-                        'max_drawdown': result.get('max_drawdown', 0),
-                        'execution_time': result.get('execution_time', 0),
-                        'backtest_timestamp': result.get('backtest_timestamp', ''),
-                        'timerange': f"{result.get('backtest_config', {}).get('start_date', '')}-{result.get('backtest_config', {}).get('end_date', '')}"
-                    })
-                except Exception as e:
-                    status_data.append({
-                        'strategy': strategy,
-                        'status': 'error_reading_result',
-                        'error': str(e)
-                    })
-            
-            elif failed_file.exists():
-                try:
-                    with open(failed_file, 'r') as f:
-                        failed_result = json.load(f)
-                    
-                    status_data.append({
-                        'strategy': strategy,
-                        'status': 'failed',
-                        'error': failed_result.get('error', 'Unknown error'),
-                        'failed_timestamp': failed_result.get('failed_timestamp', ''),
-                        'timerange': f"{failed_result.get('backtest_config', {}).get('start_date', '')}-{failed_result.get('backtest_config', {}).get('end_date', '')}"
-                    })
-                except Exception as e:
-                    status_data.append({
-                        'strategy': strategy,
-                        'status': 'error_reading_failed',
-                        'error': str(e)
-                    })
-            
-            else:
-                status_data.append({
-                    'strategy': strategy,
-                    'status': 'pending',
-                })
+        status_data = [status for status, _ in loaded]
+        
+        # Keep cache entries only for the files seen in this run
+        new_cache = dict(record for _, record in loaded if record)
+        if new_cache != cache:
+            self.save_status_cache(new_cache)
         
         return status_data
     
+    def get_single_strategy_status(self, strategy, cache=None, result_files=None):
+        """
+        Get the status entry for one strategy from its result or failed file.
+        
+        Args:
+            strategy: Strategy name
+            cache: Status cache from load_status_cache()
+            result_files: Output of scan_result_files(); scanned here when not given
+        
+        Returns:
+            Tuple of (status_entry, cache_record) where cache_record is (path, (mtime_ns, size, status_entry))
+            for a successfully read file, or None
+        """
+        cache = cache or {}
+        if result_files is None:
+            result_files = self.scan_result_files()
+        
+        kind, entry = result_files.get(strategy, ('pending', None))
+        if entry is None:
+            return {
+                'strategy': strategy,
+                'status': 'pending',
+            }, None
+        
+        if kind == 'completed':
+            reader, keys = self._completed_status, RESULT_STATUS_KEYS
+        else:
+            reader, keys = self._failed_status, FAILED_STATUS_KEYS
+        path = entry.path
+        try:
+            st = entry.stat()
+        except OSError as e:
+            return reader(strategy, None, e), None
+        
+        # Reuse the parsed entry if the file is unchanged since it was cached
+        cached = cache.get(path)
+        if cached and cached[0] == st.st_mtime_ns and cached[1] == st.st_size:
+            return cached[2], (path, cached)
+        
+        try:
+            data = load_status_fields(path, keys)
+        except Exception as e:
+            return reader(strategy, None, e), None
+        status = reader(strategy, data, None)
+        return status, (path, (st.st_mtime_ns, st.st_size, status))
+    
+    def _completed_status(self, strategy, result, error):
+        """Build the status entry for a strategy with a result file."""
+        if error is not None:
+            return {
+                'strategy': strategy,
+                'status': 'error_reading_result',
+                'error': str(error)
+            }
+        
+        return {
+            'strategy': strategy,
+            'status': 'completed',
+            'total_profit_percent': result.get('total_profit_percent', 0),
+            'total_trades': result.get('total_trades', 0),
+            'win_rate': result.get('win_rate', 0),
+            'max_drawdown': result.get('max_drawdown', 0),
+            'execution_time': result.get('execution_time', 0),
+            'backtest_timestamp': result.get('backtest_timestamp', ''),
+            'timerange': f"{result.get('backtest_config', {}).get('start_date', '')}-{result.get('backtest_config', {}).get('end_date', '')}"
+        }
+    
+    def _failed_status(self, strategy, failed_result, error):
+        """Build the status entry for a strategy with a failed file."""
+        if error is not None:
+            return {
+                'strategy': strategy,
+                'status': 'error_reading_failed',
+                'error': str(error)
+            }
+        
+        return {
+            'strategy': strategy,
+            'status': 'failed',
+            'error': failed_result.get('error', 'Unknown error'),
+            'failed_timestamp': failed_result.get('failed_timestamp', ''),
+            'timerange': f"{failed_result.get('backtest_config', {}).get('start_date', '')}-{failed_result.get('backtest_config', {}).get('end_date', '')}"
+        }
+    
     def print_status_summary(self):
         """Print a summary of strategy statuses."""
         status_data = self.get_strategy_status()
@@ -124,10 +250,10 @@ class StrategyStatusChecker:
             print("\n📈 TOP 10 PERFORMING COMPLETED STRATEGIES:")
             print("-" * 50)
             
-            # Sort by profit percentage
-            completed_sorted = sorted(completed, key=lambda x: x.get('total_profit_percent', 0), reverse=True)
+            # Only the top 10 are shown, so select them without sorting the whole list
+            top_completed = heapq.nlargest(10, completed, key=lambda x: x.get('total_profit_percent', 0))
             
-            for i, strategy in enumerate(completed_sorted[:10], 1):
+            for i, strategy in enumerate(top_completed, 1):
                 profit = strategy.get('total_profit_percent', 0)
                 trades = strategy.get('total_trades', 0)
                 win_rate = strategy.get('win_rate', 0)
@@ -159,25 +285,39 @@ class StrategyStatusChecker:
         
         return status_data
     
-    def export_status_csv(self, filename=None):
-        """Export status to CSV file."""
+    def export_status_csv(self, filename=None, output_format='csv'):
+        """Export status to a CSV (or feather/parquet) file."""
         if filename is None:
             timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
             filename = self.results_dir / f"strategy_status_{timestamp}.csv"
         
         status_data = self.get_strategy_status()
-        df = pd.DataFrame(status_data)
-        df.to_csv(filename, index=False)
+        if output_format == 'csv':
+            # Plain list of dicts, so write it directly rather than via a DataFrame
+            filename = Path(filename).with_suffix('.csv')
+            fieldnames = list(dict.fromkeys(key for item in status_data for key in item))
+            with open(filename, 'w', newline='', buffering=1 << 20) as f:
+                writer = csv.DictWriter(f, fieldnames=fieldnames, lineterminator='\n')
+                writer.writeheader()
+                writer.writerows(status_data)
+        else:
+            df = pd.DataFrame(status_data)
+            filename = utils.save_dataframe(df, filename, output_format)
         print(f"\n📄 Status exported to: {filename}")
         return filename
 
 def main():
+    parser = argparse.ArgumentParser(description='Strategy Backtest Status Checker')
+    parser.add_argument('--format', choices=utils.REPORT_FORMATS, default='csv',
+                       help='Status export format (default: csv; feather/parquet require pyarrow)')
+    args = parser.parse_args()
+    
     checker = StrategyStatusChecker()
     status_data = checker.print_status_summary()
     
     # Automatically export status to CSV
     try:
-        checker.export_status_csv()
+        checker.export_status_csv(output_format=args.format)
     except KeyboardInterrupt:
         print("\nExiting...")
 
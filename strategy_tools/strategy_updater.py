@@ -6,10 +6,12 @@ This script updates all strategies from the old freqtrade interface (v2) to the
 
 import os
 import re
+import mmap
 import shutil
 import logging
-from typing import List
+from typing import List, Optional, Tuple
 from pathlib import Path
+from concurrent.futures import ProcessPoolExecutor
 
 # Configure logging
 logging.basicConfig(
@@ -22,12 +24,64 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Fixed patterns, compiled once at import
+INTERFACE_VERSION_RE = re.compile(r'INTERFACE_VERSION\s*=\s*[0-9]+')
+STRATEGY_CLASS_RE = re.compile(r'(class\s+\w+\s*\([^)]*IStrategy[^)]*\)\s*:)')
+# (name, pattern, replacement) for the stoploss helpers that gained an is_short argument
+HELPER_FUNCTION_SUBS = tuple(
+    (name, re.compile(rf'{name}\s*\(\s*([^,)]+)\s*,\s*([^,)]+)\s*\)'), rf'{name}(\1, \2, is_short=trade.is_short)')
+    for name in ('stoploss_from_open', 'stoploss_from_absolute')
+)
+STRATEGY_IMPORT_RE = re.compile(r'from freqtrade\.strategy import ([^)]+)')
+NON_ASCII_BYTES_RE = re.compile(rb'[\x80-\xff]')
+
+# Files at least this large are pre-scanned through mmap instead of being read into memory first
+MMAP_MIN_SIZE = 64 * 1024
+
+def _alternation(names) -> str:
+    """Regex alternation of literal names, longest first so prefixes never shadow longer names."""
+    return '|'.join(re.escape(name) for name in sorted(names, key=len, reverse=True))
+
+def read_strategy_source(file_path: Path) -> str:
+    """Read a strategy file as text, decoding the raw bytes in one step (universal newlines, like open())."""
+    return decode_strategy_source(file_path.read_bytes())
+
+def decode_strategy_source(data: bytes) -> str:
+    """Decode raw strategy bytes as UTF-8 text with universal newlines."""
+    content = data.decode('utf-8')
+    if '\r' in content:
+        content = content.replace('\r\n', '\n').replace('\r', '\n')
+    return content
+
+# Updater copy used by each worker process, set once by _init_update_worker
+_worker_updater = None
+
+def _init_update_worker(updater: 'StrategyUpdater'):
+    """Process pool initializer: keep one updater (and its compiled patterns) per worker."""
+    global _worker_updater
+    _worker_updater = updater
+
+def _prepare_strategy_file(file_path: Path) -> Tuple[bool, Optional[str], List[str], int]:
+    """Process pool entry point: prepare one strategy file, returning (success, new content, issues, unchanged count)."""
+    _worker_updater.issues = []
+    _worker_updater.unchanged_count = 0
+    success, new_content = _worker_updater.prepare_strategy_file(file_path)
+    return success, new_content, _worker_updater.issues, _worker_updater.unchanged_count
+
 class StrategyUpdater:
-    def __init__(self, strategies_dir: str = "user_data/strategies"):
+    # Below this many files, process startup costs more than it saves
+    PROCESS_POOL_MIN_FILES = 16
+    
+    def __init__(self, strategies_dir: str = "user_data/strategies", process_workers: Optional[int] = None):
         self.strategies_dir = Path(strategies_dir)
         self.backup_dir = self.strategies_dir.parent / "strategies_backup"
         self.updated_count = 0
         self.failed_count = 0
+        self.unchanged_count = 0  # Processed successfully but already on the v3 interface
+        # Files are independent CPU-bound regex work, so spread them over processes
+        self.process_workers = process_workers or os.cpu_count() or 1
+        # Verification issues gathered during the update pass; None until one has run
+        self.issues = None
         
         # Method name mappings (old -> new)
         self.method_mappings = {
@@ -69,6 +123,12 @@ class StrategyUpdater:
             'sell': 'exit',
         }
         
+        # Unfilled timeout mappings (old -> new)
+        self.unfilledtimeout_mappings = {
+            'buy': 'entry',
+            'sell': 'exit',
+        }
+        
         # Callback parameter updates
         self.callback_updates = {
             'custom_stake_amount': {
@@ -93,155 +153,150 @@ class StrategyUpdater:
             }
         }
         
+        # Precompile the mapping patterns once so each file only runs match/substitute.
+        # Method and property names share one alternation: def/self.method( or [self.]property [=]
+        self._identifier_re = re.compile(
+            rf'(?P<method_prefix>def\s+|self\.)(?P<method>{_alternation(self.method_mappings)})\s*\('
+            rf'|(?P<prop_self>self\.)?(?P<prop>{_alternation(self.property_mappings)})(?P<prop_assign>\s*=)?'
+        )
+        # Quoted column names, which also covers dataframe['buy'] style access
+        self._column_re = re.compile(rf"(['\"])({_alternation(self.column_mappings)})\1")
+        
+        # order_types, order_time_in_force and unfilledtimeout share the quoted 'key': form, so rename
+        # them in one pass; order_types was applied first, so its entries win on overlap
+        self._dict_key_mappings = {**self.unfilledtimeout_mappings, **self.time_in_force_mappings,
+                                   **self.order_types_mappings}
+        self._dict_key_re = re.compile(rf'(["\'])({_alternation(self._dict_key_mappings)})\1\s*:')
+        # Every literal an updater after update_interface_version needs; files with none of them are left alone
+        triggers = {*self.method_mappings, *self.column_mappings, *self.property_mappings,
+                    *self._dict_key_mappings, *self.callback_updates,
+                    'buy', 'sell', 'trade.sell_reason', 'trade.nr_of_successful_buys',
+                    'stoploss_from_open', 'stoploss_from_absolute'}
+        self._trigger_re = re.compile(_alternation(triggers))
+        # Same check on raw bytes, plus the interface version markers, to skip decoding untouched files
+        self._trigger_bytes_re = re.compile(_alternation(triggers | {'INTERFACE_VERSION', 'IStrategy'}).encode())
+        
+        # Verification probes: any leftover old method definition or dataframe column, in one scan each
+        self._verify_method_re = re.compile(rf'def ({_alternation(self.method_mappings)})\(')
+        self._verify_column_re = re.compile(rf'dataframe\[(["\'])({_alternation(self.column_mappings)})\1\]')
+        # (method name, signature pattern, updates) per callback, iterated as a flat tuple per file
+        self._callback_subs = tuple((method_name, re.compile(rf'def\s+{method_name}\s*\(([^)]*)\):'), updates)
+                                    for method_name, updates in self.callback_updates.items())
+        
     def create_backup(self):
-        """Create a backup of all strategies before updating."""
+        """Start a fresh backup directory; files are copied into it only when they change."""
         if self.backup_dir.exists():
             shutil.rmtree(self.backup_dir)
         
-        shutil.copytree(self.strategies_dir, self.backup_dir)
-        logger.info(f"Created backup of strategies in {self.backup_dir}")
+        self.backup_dir.mkdir(parents=True)
+        logger.info(f"Backing up changed strategies to {self.backup_dir}")
+    
+    def backup_file(self, file_path: Path):
+        """Copy one strategy file into the backup directory before it is rewritten."""
+        backup_path = self.backup_dir / file_path.relative_to(self.strategies_dir)
+        backup_path.parent.mkdir(parents=True, exist_ok=True)
+        shutil.copy2(file_path, backup_path)
     
     def find_strategy_files(self) -> List[Path]:
         """Find all Python strategy files."""
-        strategy_files = []
-        for root, dirs, files in os.walk(self.strategies_dir):
-            for file in files:
-                if file.endswith('.py') and not file.startswith('__'):
-                    strategy_files.append(Path(root) / file)
-        return strategy_files
+        return [path for path in self.strategies_dir.rglob('*.py') if not path.name.startswith('__')]
     
     def update_interface_version(self, content: str) -> str:
         """Update INTERFACE_VERSION to 3."""
         # Look for existing INTERFACE_VERSION
-        version_pattern = r'INTERFACE_VERSION\s*=\s*[0-9]+'
-        if re.search(version_pattern, content):
-            content = re.sub(version_pattern, 'INTERFACE_VERSION = 3', content)
+        if 'INTERFACE_VERSION' in content and INTERFACE_VERSION_RE.search(content):
+            content = INTERFACE_VERSION_RE.sub('INTERFACE_VERSION = 3', content)
         else:
             # Add INTERFACE_VERSION if not present
-            class_pattern = r'(class\s+\w+\s*\([^)]*IStrategy[^)]*\)\s*:)'
-            if re.search(class_pattern, content):
-                content = re.sub(class_pattern, r'\1\n    INTERFACE_VERSION = 3\n', content)
+            if 'IStrategy' in content and STRATEGY_CLASS_RE.search(content):
+                content = STRATEGY_CLASS_RE.sub(r'\1\n    INTERFACE_VERSION = 3\n', content)
         
         return content
     
-    def update_method_names(self, content: str) -> str:
-        """Update method names from old to new interface."""
-        for old_method, new_method in self.method_mappings.items():
-            # Update method definitions
-            pattern = rf'def\s+{old_method}\s*\('
-            replacement = f'def {new_method}('
-            content = re.sub(pattern, replacement, content)
-            
-            # Update method calls
-            pattern = rf'self\.{old_method}\s*\('
-            replacement = f'self.{new_method}('
-            content = re.sub(pattern, replacement, content)
+    def update_identifiers(self, content: str) -> str:
+        """Update method and strategy property names from old to new interface in one pass."""
+        return self._identifier_re.sub(self._replace_identifier, content)
+    
+    def _replace_identifier(self, match: re.Match) -> str:
+        """Replacement for one _identifier_re match."""
+        method = match.group('method')
+        if method is not None:
+            # Method definitions and self.method( calls
+            prefix = 'def ' if match.group('method_prefix').startswith('def') else 'self.'
+            return f'{prefix}{self.method_mappings[method]}('
         
-        return content
+        # Property assignments and self.property references; bare mentions stay as they are
+        prop_self, prop_assign = match.group('prop_self'), match.group('prop_assign')
+        if not prop_self and not prop_assign:
+            return match.group(0)
+        return f"{prop_self or ''}{self.property_mappings[match.group('prop')]}{' =' if prop_assign else ''}"
     
     def update_column_names(self, content: str) -> str:
         """Update dataframe column names from old to new interface."""
-        for old_col, new_col in self.column_mappings.items():
-            # Update column assignments like dataframe['buy'] = 1
-            pattern = rf"dataframe\[(['\"]){old_col}\1\]"
-            replacement = f"dataframe[\\1{new_col}\\1]"
-            content = re.sub(pattern, replacement, content)
-            
-            # Update column assignments in lists like ['buy', 'buy_tag']
-            pattern = rf"(['\"]){old_col}\1"
-            replacement = f"\\1{new_col}\\1"
-            content = re.sub(pattern, replacement, content)
-        
-        return content
-    
-    def update_property_names(self, content: str) -> str:
-        """Update strategy property names from old to new interface."""
-        for old_prop, new_prop in self.property_mappings.items():
-            # Update property assignments
-            pattern = rf'{old_prop}\s*='
-            replacement = f'{new_prop} ='
-            content = re.sub(pattern, replacement, content)
-            
-            # Update property references
-            pattern = rf'self\.{old_prop}'
-            replacement = f'self.{new_prop}'
-            content = re.sub(pattern, replacement, content)
-        
-        return content
-    
-    def update_order_types(self, content: str) -> str:
-        """Update order_types dictionary from old to new interface."""
-        for old_key, new_key in self.order_types_mappings.items():
-            # Update dictionary keys
-            pattern = rf'(["\']){old_key}\1\s*:'
-            replacement = f'\\1{new_key}\\1:'
-            content = re.sub(pattern, replacement, content)
-        
-        return content
+        # Quoted names like dataframe['buy'] = 1 or ['buy', 'buy_tag']
+        return self._column_re.sub(lambda m: f"{m.group(1)}{self.column_mappings[m.group(2)]}{m.group(1)}", content)
     
-    def update_time_in_force(self, content: str) -> str:
-        """Update order_time_in_force dictionary from old to new interface."""
-        for old_key, new_key in self.time_in_force_mappings.items():
-            # Update dictionary keys in order_time_in_force
-            pattern = rf'(["\']){old_key}\1\s*:'
-            replacement = f'\\1{new_key}\\1:'
-            content = re.sub(pattern, replacement, content)
-        
-        return content
+    def update_dict_keys(self, content: str) -> str:
+        """Update order_types, order_time_in_force and unfilledtimeout dictionary keys from old to new interface."""
+        # Quoted keys followed by ':' like 'forcesell': 'market'
+        return self._dict_key_re.sub(lambda m: f"{m.group(1)}{self._dict_key_mappings[m.group(2)]}{m.group(1)}:", content)
     
     def update_callback_signatures(self, content: str) -> str:
         """Update callback method signatures to include new parameters."""
-        for method_name, updates in self.callback_updates.items():
-            # Find method definition
-            method_pattern = rf'def\s+{method_name}\s*\([^)]*\):'
-            method_match = re.search(method_pattern, content)
+        for method_name, pattern, updates in self._callback_subs:
+            if method_name not in content:
+                continue  # Callback not implemented, skip the regex scan
             
-            if method_match:
-                # Extract current parameters
-                full_match = method_match.group(0)
-                params_start = full_match.find('(') + 1
-                params_end = full_match.rfind(')')
-                current_params = full_match[params_start:params_end]
-                
-                # Update parameters based on configuration
-                if 'add_params' in updates:
-                    for param in updates['add_params']:
-                        if param not in current_params:
-                            if current_params.strip() and not current_params.endswith(','):
-                                current_params += ', '
-                            current_params += param
-                
-                if 'replace_params' in updates:
-                    for old_param, new_param in updates['replace_params'].items():
-                        current_params = current_params.replace(old_param, new_param)
-                
-                # Reconstruct method signature
-                new_signature = f'def {method_name}({current_params}):'
-                content = content.replace(full_match, new_signature)
+            # Rewrite the first definition found, and any identical copies of it, in the same scan
+            first_match = None
+            new_signature = None
+            
+            def rebuild(match: re.Match) -> str:
+                nonlocal first_match, new_signature
+                if first_match is None:
+                    first_match = match.group(0)
+                    new_signature = self._rebuild_signature(method_name, match.group(1), updates)
+                return new_signature if match.group(0) == first_match else match.group(0)
+            
+            content = pattern.sub(rebuild, content)
         
         return content
     
+    def _rebuild_signature(self, method_name: str, current_params: str, updates: dict) -> str:
+        """Build the new signature for a callback from its current parameter list."""
+        # Update parameters based on configuration
+        if 'add_params' in updates:
+            for param in updates['add_params']:
+                if param not in current_params:
+                    if current_params.strip() and not current_params.endswith(','):
+                        current_params += ', '
+                    current_params += param
+        
+        if 'replace_params' in updates:
+            for old_param, new_param in updates['replace_params'].items():
+                current_params = current_params.replace(old_param, new_param)
+        
+        # Reconstruct method signature
+        return f'def {method_name}({current_params}):'
+    
     def update_helper_functions(self, content: str) -> str:
         """Update helper function calls to include new parameters."""
-        # Update stoploss_from_open calls
-        pattern = r'stoploss_from_open\s*\(\s*([^,)]+)\s*,\s*([^,)]+)\s*\)'
-        replacement = r'stoploss_from_open(\1, \2, is_short=trade.is_short)'
-        content = re.sub(pattern, replacement, content)
-        
-        # Update stoploss_from_absolute calls
-        pattern = r'stoploss_from_absolute\s*\(\s*([^,)]+)\s*,\s*([^,)]+)\s*\)'
-        replacement = r'stoploss_from_absolute(\1, \2, is_short=trade.is_short)'
-        content = re.sub(pattern, replacement, content)
+        # Update stoploss_from_open / stoploss_from_absolute calls
+        for name, pattern, replacement in HELPER_FUNCTION_SUBS:
+            if name in content:
+                content = pattern.sub(replacement, content)
         
         return content
     
     def update_trade_properties(self, content: str) -> str:
         """Update trade object property references."""
-        # Update sell_reason to exit_reason
-        content = re.sub(r'trade\.sell_reason', 'trade.exit_reason', content)
+        if 'trade.' not in content:
+            return content
         
-        # Update nr_of_successful_buys to nr_of_successful_entries
-        content = re.sub(r'trade\.nr_of_successful_buys', 'trade.nr_of_successful_entries', content)
+        # Plain literals, so str.replace is enough: sell_reason -> exit_reason,
+        # nr_of_successful_buys -> nr_of_successful_entries
+        content = content.replace('trade.sell_reason', 'trade.exit_reason')
+        content = content.replace('trade.nr_of_successful_buys', 'trade.nr_of_successful_entries')
         
         return content
     
@@ -252,64 +307,137 @@ class StrategyUpdater:
             # Add imports if not present
             if 'from freqtrade.strategy import' in content:
                 # Add to existing import
-                import_pattern = r'from freqtrade\.strategy import ([^)]+)'
-                import_match = re.search(import_pattern, content)
+                import_match = STRATEGY_IMPORT_RE.search(content)
                 if import_match:
                     imports = import_match.group(1)
                     if 'stoploss_from_open' not in imports:
                         imports += ', stoploss_from_open'
                     if 'stoploss_from_absolute' not in imports:
                         imports += ', stoploss_from_absolute'
-                    content = re.sub(import_pattern, f'from freqtrade.strategy import {imports}', content)
+                    content = STRATEGY_IMPORT_RE.sub(f'from freqtrade.strategy import {imports}', content)
         
         return content
     
-    def update_unfilledtimeout(self, content: str) -> str:
-        """Update unfilledtimeout configuration from old to new interface."""
-        # Update buy -> entry, sell -> exit
-        content = re.sub(r'(["\'])buy\1\s*:', r'\1entry\1:', content)
-        content = re.sub(r'(["\'])sell\1\s*:', r'\1exit\1:', content)
+    def transform_source(self, content: str) -> str:
+        """Apply every interface update to a strategy source, in order."""
+        content = self.update_interface_version(content)
         
-        return content
+        # One scan decides whether any of the remaining updaters can match
+        if not self._trigger_re.search(content):
+            return content
+        
+        content = self.update_identifiers(content)
+        content = self.update_column_names(content)
+        content = self.update_dict_keys(content)
+        content = self.update_callback_signatures(content)
+        content = self.update_helper_functions(content)
+        content = self.update_trade_properties(content)
+        return self.update_imports(content)
+    
+    def read_source_if_triggered(self, file_path: Path) -> Optional[str]:
+        """
+        Read a strategy file, decoding it only if an updater could change it.
+        
+        Returns:
+            The decoded source, or None for plain ASCII files with no trigger bytes. Files with
+            non-ASCII bytes are always decoded so invalid UTF-8 is still reported.
+        """
+        with open(file_path, 'rb') as f:
+            if os.fstat(f.fileno()).st_size >= MMAP_MIN_SIZE:
+                # Scan the mapped pages directly; only copy them out when there is work to do
+                with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                    if not self._trigger_bytes_re.search(mm) and not NON_ASCII_BYTES_RE.search(mm):
+                        return None
+                    data = mm[:]
+            else:
+                data = f.read()
+                if data.isascii() and not self._trigger_bytes_re.search(data):
+                    return None
+        return decode_strategy_source(data)
     
     def update_strategy_file(self, file_path: Path) -> bool:
         """Update a single strategy file."""
+        success, new_content = self.prepare_strategy_file(file_path)
+        if new_content is not None:
+            return self.write_strategy_file(file_path, new_content)
+        return success
+    
+    def prepare_strategy_file(self, file_path: Path) -> Tuple[bool, Optional[str]]:
+        """
+        Compute the updated source of a strategy file without writing it.
+        
+        Returns:
+            Tuple of (success, new_content) where new_content is None if the file needs no write
+        """
+        content = None
         try:
-            logger.info(f"Updating strategy: {file_path}")
+            if logger.isEnabledFor(logging.INFO):
+                logger.info("Updating strategy: %s", file_path)
             
-            # Read the file
-            with open(file_path, 'r', encoding='utf-8') as f:
-                content = f.read()
+            # Read the file; None means its raw bytes hold nothing any updater acts on
+            source = self.read_source_if_triggered(file_path)
+            if source is None:
+                self.unchanged_count += 1
+                logger.debug("ℹ️  No changes needed: %s", file_path)
+                return True, None
+            content = source
             
             # Apply all updates
             original_content = content
+            content = self.transform_source(content)
             
-            content = self.update_interface_version(content)
-            content = self.update_method_names(content)
-            content = self.update_column_names(content)
-            content = self.update_property_names(content)
-            content = self.update_order_types(content)
-            content = self.update_time_in_force(content)
-            content = self.update_callback_signatures(content)
-            content = self.update_helper_functions(content)
-            content = self.update_trade_properties(content)
-            content = self.update_imports(content)
-            content = self.update_unfilledtimeout(content)
+            # Verify the updated source while it is still in memory
+            if self.issues is not None:
+                self._verify(content, file_path, self.issues)
             
             # Only write if content changed
             if content != original_content:
-                with open(file_path, 'w', encoding='utf-8') as f:
-                    f.write(content)
-                logger.info(f"✅ Updated: {file_path}")
-                return True
+                return True, content
             else:
-                logger.info(f"ℹ️  No changes needed: {file_path}")
-                return True
+                # Summarized in update_all_strategies unless debugging
+                self.unchanged_count += 1
+                logger.debug("ℹ️  No changes needed: %s", file_path)
+                return True, None
                 
         except Exception as e:
-            logger.error(f"❌ Failed to update {file_path}: {str(e)}")
+            if content is None and self.issues is not None:
+                self.issues.append(f"{file_path}: Error reading file - {str(e)}")
+            logger.error("❌ Failed to update %s: %s", file_path, e)
+            return False, None
+    
+    def write_strategy_file(self, file_path: Path, content: str) -> bool:
+        """Back up a strategy file and overwrite it with its updated source."""
+        try:
+            self.backup_file(file_path)
+            with open(file_path, 'wb', buffering=1 << 17) as f:
+                f.write(content.encode('utf-8'))
+            if logger.isEnabledFor(logging.INFO):
+                logger.info("✅ Updated: %s", file_path)
+            return True
+        except Exception as e:
+            logger.error("❌ Failed to update %s: %s", file_path, e)
             return False
     
+    def update_strategy_files(self, strategy_files: List[Path]) -> List[bool]:
+        """Update several strategy files, in worker processes when there are enough of them."""
+        if self.process_workers > 1 and len(strategy_files) >= self.PROCESS_POOL_MIN_FILES:
+            chunksize = max(1, min(8, len(strategy_files) // (self.process_workers * 4)))
+            with ProcessPoolExecutor(max_workers=self.process_workers, initializer=_init_update_worker,
+                                     initargs=(self,)) as executor:
+                results = list(executor.map(_prepare_strategy_file, strategy_files, chunksize=chunksize))
+            prepared = []
+            for success, new_content, issues, unchanged in results:
+                if self.issues is not None:
+                    self.issues.extend(issues)
+                self.unchanged_count += unchanged
+                prepared.append((success, new_content))
+        else:
+            prepared = [self.prepare_strategy_file(file_path) for file_path in strategy_files]
+        
+        # All sources are computed first; then the changed ones are written back in one batch
+        return [self.write_strategy_file(file_path, new_content) if new_content is not None else success
+                for file_path, (success, new_content) in zip(strategy_files, prepared)]
+    
     def update_all_strategies(self):
         """Update all strategy files."""
         logger.info("Starting strategy interface update process...")
@@ -320,10 +448,11 @@ class StrategyUpdater:
         # Find all strategy files
         strategy_files = self.find_strategy_files()
         logger.info(f"Found {len(strategy_files)} strategy files to update")
+        self.issues = []
         
         # Update each file
-        for file_path in strategy_files:
-            if self.update_strategy_file(file_path):
+        for success in self.update_strategy_files(strategy_files):
+            if success:
                 self.updated_count += 1
             else:
                 self.failed_count += 1
@@ -332,6 +461,7 @@ class StrategyUpdater:
         logger.info(f"\n📊 UPDATE SUMMARY:")
         logger.info(f"Total files processed: {len(strategy_files)}")
         logger.info(f"Successfully updated: {self.updated_count}")
+        logger.info(f"Already up to date: {self.unchanged_count}")
         logger.info(f"Failed updates: {self.failed_count}")
         logger.info(f"Backup created at: {self.backup_dir}")
         
@@ -340,32 +470,33 @@ class StrategyUpdater:
         else:
             logger.info("🎉 All strategies updated successfully!")
     
+    def _verify(self, content: str, file_path: Path, issues: List[str]):
+        """Append any old interface elements still present in a strategy source to issues."""
+        # Check for old method names
+        found_methods = {match.group(1) for match in self._verify_method_re.finditer(content)}
+        for old_method in self.method_mappings:
+            if old_method in found_methods:
+                issues.append(f"{file_path}: Still contains old method {old_method}")
+        
+        # Check for old column names in assignments - a basic check, might have false positives
+        found_columns = {match.group(2) for match in self._verify_column_re.finditer(content)}
+        for old_col in self.column_mappings:
+            if old_col in found_columns:
+                issues.append(f"{file_path}: Still contains old column {old_col}")
+    
     def verify_updates(self):
         """Verify that updates were applied correctly."""
         logger.info("Verifying strategy updates...")
         
-        strategy_files = self.find_strategy_files()
-        issues = []
-        
-        for file_path in strategy_files:
-            try:
-                with open(file_path, 'r', encoding='utf-8') as f:
-                    content = f.read()
-                
-                # Check for old method names
-                for old_method in self.method_mappings.keys():
-                    if f'def {old_method}(' in content:
-                        issues.append(f"{file_path}: Still contains old method {old_method}")
-                
-                # Check for old column names in assignments
-                for old_col in self.column_mappings.keys():
-                    if f"'{old_col}'" in content or f'"{old_col}"' in content:
-                        # This is a basic check - might have false positives
-                        if f"dataframe['{old_col}']" in content or f'dataframe["{old_col}"]' in content:
-                            issues.append(f"{file_path}: Still contains old column {old_col}")
-                
-            except Exception as e:
-                issues.append(f"{file_path}: Error reading file - {str(e)}")
+        issues = self.issues
+        if issues is None:
+            # No update pass has run, so read the files now
+            issues = []
+            for file_path in self.find_strategy_files():
+                try:
+                    self._verify(read_strategy_source(file_path), file_path, issues)
+                except Exception as e:
+                    issues.append(f"{file_path}: Error reading file - {str(e)}")
         
         if issues:
             logger.warning(f"Found {len(issues)} potential issues:")
@@ -4,77 +4,225 @@ Strategy Tools Utilities
 Shared functions for strategy detection, result parsing, and common operations.
 """
 
+import os
+import re
 import json
+import mmap
 import zipfile
 import logging
+from functools import lru_cache
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 from pathlib import Path
-from typing import Dict, List, Optional, Tuple
+from typing import Dict, List, Optional, Set, Tuple
 from datetime import datetime
 
 logger = logging.getLogger(__name__)
 
+# orjson parses straight from bytes; fall back to stdlib json if missing
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Cached result files in individual_results: <strategy>_result.json or <strategy>_failed.json
+INDIVIDUAL_RESULT_RE = re.compile(r'_(result|failed)\.json$')
+
+# Backtest files at least this large are parsed straight from a memory map instead of a copied buffer
+MMAP_MIN_SIZE = 64 * 1024
+
+def json_loads(data: bytes):
+    """Parse JSON bytes, using orjson when available."""
+    return orjson.loads(data) if orjson else json.loads(data)
+
+def json_load_file(f):
+    """Parse an open binary JSON file, from a memory map when it is large and orjson can read the buffer."""
+    if orjson and os.fstat(f.fileno()).st_size >= MMAP_MIN_SIZE:
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm, memoryview(mm) as view:
+            return orjson.loads(view)
+    return json_loads(f.read())
+
+def _load_json_file(path: Path) -> Tuple[Optional[Dict], Optional[Exception]]:
+    """Load one JSON file, returning (data, None) or (None, error) so thread pool callers can log failures in order."""
+    try:
+        with open(path, 'rb') as f:
+            return json_loads(f.read()), None
+    except Exception as e:
+        return None, e
+
+def _has_failure_marker(strategy_dir: Path) -> bool:
+    """Check for a *_failed* or *error* file, stopping at the first one."""
+    with os.scandir(strategy_dir) as entries:
+        for entry in entries:
+            name = entry.name
+            if '_failed' in name or 'error' in name:
+                return True
+    return False
+
+def _parse_strategy_dir(results_dir: str, strategy_dir: Path) -> Optional[Dict]:
+    """Process pool entry point: parse one strategy directory's backtest data."""
+    return StrategyResultsUtils(results_dir)._parse_strategy_json_data(strategy_dir)
+
+
 class StrategyResultsUtils:
     """Utility class for working with strategy backtest results."""
     
-    def __init__(self, results_dir: str = "user_data/backtest_results"):
+    # Below this many strategy directories, process startup costs more than it saves
+    PROCESS_POOL_MIN_DIRS = 32
+    # Threads overlapping result file reads; open/read and orjson parsing release the GIL
+    PARSE_THREADS = min(32, (os.cpu_count() or 1) * 4)
+    
+    # Default value of every extracted metric, copied for each parsed strategy
+    _METRICS_DEFAULTS = {
+        'strategy': '',
+        'total_return': 0.0,
+        'total_trades': 0,
+        'winning_trades': 0,
+        'losing_trades': 0,
+        'win_rate': 0.0,
+        'profit_factor': 0.0,
+        'sharpe_ratio': 0.0,
+        'max_drawdown': 0.0,
+        'avg_profit': 0.0,
+        'total_profit_abs': 0.0,
+        'total_profit_percent': 0.0,
+        'avg_duration': '',
+        'best_pair': '',
+        'worst_pair': '',
+        'backtest_start': '',
+        'backtest_end': '',
+        'market_change': 0.0,
+        'cagr': 0.0,
+        'expectancy': 0.0,
+        'sortino': 0.0,
+        'calmar': 0.0,
+        'sqn': 0.0
+    }
+    
+    def __init__(self, results_dir: str = "user_data/backtest_results", process_workers: Optional[int] = None):
         self.results_dir = Path(results_dir)
         self.individual_results_dir = self.results_dir / "individual_results"
+        # Worker processes used to parse strategy directories; None or 1 parses in this process
+        self.process_workers = process_workers
+        # Parsed metrics per strategy directory: strategy_dir -> (mtime_ns, size, metrics or None),
+        # keyed on .last_result.json, which freqtrade rewrites with every new backtest
+        self._parse_cache: Dict[Path, Tuple[int, int, Optional[Dict]]] = {}
+    
+    def parse_strategy_dirs(self, strategy_dirs: List[Path]) -> List[Optional[Dict]]:
+        """Parse several strategy directories, in worker processes when enough of them need parsing."""
+        if not (self.process_workers and self.process_workers > 1 and len(strategy_dirs) >= self.PROCESS_POOL_MIN_DIRS):
+            return self._thread_map(self.parse_strategy_json_data, strategy_dirs)
+        
+        # Only directories whose .last_result.json changed since the cached parse go to the pool
+        to_parse = []
+        for strategy_dir in strategy_dirs:
+            key = self._last_result_key(strategy_dir)
+            cached = self._parse_cache.get(strategy_dir)
+            if key is not None and not (cached and cached[:2] == key):
+                to_parse.append((strategy_dir, key))
+        
+        if len(to_parse) >= self.PROCESS_POOL_MIN_DIRS:
+            dirs = [strategy_dir for strategy_dir, _ in to_parse]
+            chunksize = max(1, len(dirs) // (self.process_workers * 4))
+            with ProcessPoolExecutor(max_workers=self.process_workers) as executor:
+                parsed = executor.map(_parse_strategy_dir, [str(self.results_dir)] * len(dirs), dirs, chunksize=chunksize)
+                for (strategy_dir, key), metrics in zip(to_parse, parsed):
+                    self._parse_cache[strategy_dir] = (*key, metrics)
+        
+        return [self.parse_strategy_json_data(strategy_dir) for strategy_dir in strategy_dirs]
+    
+    def _thread_map(self, fn, items: List) -> List:
+        """Map fn over items on a thread pool, keeping their order; small batches run inline."""
+        if len(items) < 2:
+            return [fn(item) for item in items]
+        with ThreadPoolExecutor(max_workers=min(self.PARSE_THREADS, len(items))) as executor:
+            return list(executor.map(fn, items))
+    
+    def _last_result_key(self, strategy_dir: Path) -> Optional[Tuple[int, int]]:
+        """Return (mtime_ns, size) of the directory's .last_result.json, or None if there is none."""
+        try:
+            st = os.stat(strategy_dir / ".last_result.json")
+        except OSError:
+            return None
+        return st.st_mtime_ns, st.st_size
     
     def parse_strategy_json_data(self, strategy_dir: Path) -> Optional[Dict]:
-        """Parse structured JSON backtest data from a strategy directory."""
+        """Parse structured JSON backtest data from a strategy directory, reusing the last parse if unchanged."""
+        key = self._last_result_key(strategy_dir)
+        if key is None:
+            logger.debug("No .last_result.json found in %s", strategy_dir)
+            return None
+        
+        cached = self._parse_cache.get(strategy_dir)
+        if cached and cached[:2] == key:
+            return cached[2]
+        
+        metrics = self._parse_strategy_json_data(strategy_dir)
+        self._parse_cache[strategy_dir] = (*key, metrics)
+        return metrics
+    
+    def _parse_strategy_json_data(self, strategy_dir: Path) -> Optional[Dict]:
+        """Parse structured JSON backtest data from a strategy directory without consulting the cache."""
         try:
-            # Check for .last_result.json to get the latest backtest
+            # .last_result.json names the latest backtest
             last_result_file = strategy_dir / ".last_result.json"
-            if not last_result_file.exists():
-                logger.debug(f"No .last_result.json found in {strategy_dir}")
-                return None
             
             # Load the latest result filename
-            with open(last_result_file, 'r') as f:
-                last_result = json.load(f)
+            with open(last_result_file, 'rb') as f:
+                last_result = json_loads(f.read())
             
             latest_backtest = last_result.get('latest_backtest')
             if not latest_backtest:
-                logger.debug(f"No latest_backtest in {last_result_file}")
+                logger.debug("No latest_backtest in %s", last_result_file)
                 return None
             
-            # Handle both JSON files and ZIP files containing JSON
-            json_filename = latest_backtest.replace('.zip', '.json')
+            # Handle both JSON files and ZIP files containing JSON; only a trailing .zip is swapped,
+            # so a '.zip' elsewhere in the name is left alone
+            if latest_backtest.endswith('.zip'):
+                json_filename = latest_backtest[:-len('.zip')] + '.json'
+            else:
+                json_filename = latest_backtest
             json_file = strategy_dir / json_filename
             zip_file = strategy_dir / latest_backtest
             
             backtest_data = None
             
-            # Try to load JSON file first (if it exists)
-            if json_file.exists():
-                with open(json_file, 'r') as f:
-                    backtest_data = json.load(f)
-                    logger.debug(f"Loaded JSON file: {json_file}")
+            # Try to load JSON file first; opening it directly saves a separate exists() stat
+            try:
+                json_fh = open(json_file, 'rb')
+            except FileNotFoundError:
+                json_fh = None
+            
+            if json_fh is not None:
+                with json_fh:
+                    backtest_data = json_load_file(json_fh)
+                    logger.debug("Loaded JSON file: %s", json_file)
             
             # If no JSON file, try to extract from ZIP file
-            elif zip_file.exists() and latest_backtest.endswith('.zip'):
+            elif latest_backtest.endswith('.zip'):
                 try:
                     with zipfile.ZipFile(zip_file, 'r') as zf:
-                        # Look for the JSON file inside the ZIP
-                        json_files = [name for name in zf.namelist() if name.endswith('.json') and not name.endswith('_config.json')]
-                        if json_files:
-                            # Use the first JSON file found (should be the backtest results)
-                            json_filename_in_zip = json_files[0]
-                            with zf.open(json_filename_in_zip) as json_in_zip:
-                                backtest_data = json.load(json_in_zip)
-                                logger.debug(f"Extracted JSON from ZIP: {zip_file} -> {json_filename_in_zip}")
+                        # Look for the first JSON file inside the ZIP (should be the backtest results)
+                        json_info = next((info for info in zf.infolist()
+                                          if info.filename.endswith('.json') and not info.filename.endswith('_config.json')), None)
+                        if json_info is not None:
+                            # Read the member in one go; parsing raw bytes beats streaming through a file wrapper
+                            backtest_data = json_loads(zf.read(json_info))
+                            logger.debug("Extracted JSON from ZIP: %s -> %s", zip_file, json_info.filename)
                         else:
-                            logger.debug(f"No JSON backtest file found in ZIP: {zip_file}")
+                            logger.debug("No JSON backtest file found in ZIP: %s", zip_file)
                             return None
+                except FileNotFoundError:
+                    logger.debug("Neither JSON file nor ZIP file found for %s", strategy_dir.name)
+                    return None
                 except Exception as e:
-                    logger.debug(f"Error extracting JSON from ZIP {zip_file}: {e}")
+                    logger.debug("Error extracting JSON from ZIP %s: %s", zip_file, e)
                     return None
             else:
-                logger.debug(f"Neither JSON file nor ZIP file found for {strategy_dir.name}")
+                logger.debug("Neither JSON file nor ZIP file found for %s", strategy_dir.name)
                 return None
             
             if not backtest_data:
-                logger.debug(f"No backtest data loaded for {strategy_dir.name}")
+                logger.debug("No backtest data loaded for %s", strategy_dir.name)
                 return None
             
             # Extract strategy metrics from the structured data
@@ -92,220 +240,244 @@ class StrategyResultsUtils:
                 return None
             
             # Extract key metrics from the comprehensive backtest data
-            metrics = {
-                'strategy': strategy_name,
-                'total_return': 0.0,
-                'total_trades': 0,
-                'winning_trades': 0,
-                'losing_trades': 0,
-                'win_rate': 0.0,
-                'profit_factor': 0.0,
-                'sharpe_ratio': 0.0,
-                'max_drawdown': 0.0,
-                'avg_profit': 0.0,
-                'total_profit_abs': 0.0,
-                'total_profit_percent': 0.0,
-                'avg_duration': '',
-                'best_pair': '',
-                'worst_pair': '',
-                'backtest_start': '',
-                'backtest_end': '',
-                'market_change': 0.0,
-                'cagr': 0.0,
-                'expectancy': 0.0,
-                'sortino': 0.0,
-                'calmar': 0.0,
-                'sqn': 0.0
-            }
+            metrics = self._METRICS_DEFAULTS.copy()
+            metrics['strategy'] = strategy_name
             
             # Extract metrics from the backtest data structure
             # Check for strategy_comparison section (newer format)
             strategy_comparison = backtest_data.get('strategy_comparison', [])
             if strategy_comparison and len(strategy_comparison) > 0:
                 # Use the first (and usually only) strategy comparison entry
-                comparison_data = strategy_comparison[0]
-                
-                metrics.update({
-                    'total_trades': comparison_data.get('trades', 0),
-                    'total_profit_percent': comparison_data.get('profit_total_pct', 0.0),
-                    'total_profit_abs': comparison_data.get('profit_total_abs', 0.0),
-                    'win_rate': comparison_data.get('winrate', 0.0) * 100,  # Convert to percentage
-                    'profit_factor': comparison_data.get('profit_factor', 0.0),
-                    'sharpe_ratio': comparison_data.get('sharpe', 0.0),
-                    'max_drawdown': comparison_data.get('max_drawdown_account', 0.0) * 100,  # Convert to percentage
-                    'avg_profit': comparison_data.get('profit_mean_pct', 0.0),
-                    'cagr': comparison_data.get('cagr', 0.0) * 100,  # Convert to percentage
-                    'expectancy': comparison_data.get('expectancy', 0.0),
-                    'sortino': comparison_data.get('sortino', 0.0),
-                    'calmar': comparison_data.get('calmar', 0.0),
-                    'sqn': comparison_data.get('sqn', 0.0),
-                    'winning_trades': comparison_data.get('wins', 0),
-                    'losing_trades': comparison_data.get('losses', 0),
-                    'avg_duration': comparison_data.get('duration_avg', '')
-                })
-                
-                # Extract backtest dates and other info from root level if available
-                if 'backtest_start' in backtest_data:
-                    metrics['backtest_start'] = backtest_data.get('backtest_start', '')
-                    metrics['backtest_end'] = backtest_data.get('backtest_end', '')
-                    metrics['market_change'] = backtest_data.get('market_change', 0.0)
-                
-                # Extract best/worst pairs from root level if available
-                best_pair_data = backtest_data.get('best_pair', {})
-                worst_pair_data = backtest_data.get('worst_pair', {})
-                if best_pair_data:
-                    metrics['best_pair'] = best_pair_data.get('key', '')
-                if worst_pair_data:
-                    metrics['worst_pair'] = worst_pair_data.get('key', '')
-                
-                logger.debug(f"Parsed metrics for {strategy_name}: {metrics['total_profit_percent']:.2f}% return, {metrics['total_trades']} trades")
-                return metrics
+                self._extract_comparison(backtest_data, strategy_comparison[0], metrics)
             
             # Check if this is the direct format with metrics at root level (fallback)
             elif 'total_trades' in backtest_data:
-                # Direct format - metrics at root level
-                metrics.update({
-                    'total_trades': backtest_data.get('total_trades', 0),
-                    'total_profit_percent': backtest_data.get('profit_total_pct', 0.0),
-                    'total_profit_abs': backtest_data.get('profit_total_abs', 0.0),
-                    'win_rate': backtest_data.get('winrate', 0.0) * 100,  # Convert to percentage
-                    'profit_factor': backtest_data.get('profit_factor', 0.0),
-                    'sharpe_ratio': backtest_data.get('sharpe', 0.0),
-                    'max_drawdown': backtest_data.get('max_drawdown_account', 0.0) * 100,  # Convert to percentage
-                    'avg_profit': backtest_data.get('profit_mean_pct', 0.0),
-                    'cagr': backtest_data.get('cagr', 0.0),
-                    'expectancy': backtest_data.get('expectancy', 0.0),
-                    'sortino': backtest_data.get('sortino', 0.0),
-                    'calmar': backtest_data.get('calmar', 0.0),
-                    'sqn': backtest_data.get('sqn', 0.0),
-                    'backtest_start': backtest_data.get('backtest_start', ''),
-                    'backtest_end': backtest_data.get('backtest_end', ''),
-                    'market_change': backtest_data.get('market_change', 0.0)
-                })
-                
-                # Extract best/worst pairs if available
-                best_pair_data = backtest_data.get('best_pair', {})
-                worst_pair_data = backtest_data.get('worst_pair', {})
-                if best_pair_data:
-                    metrics['best_pair'] = best_pair_data.get('key', '')
-                if worst_pair_data:
-                    metrics['worst_pair'] = worst_pair_data.get('key', '')
-                
-                # Calculate wins/losses from winrate and total trades
-                total_trades = metrics['total_trades']
-                winrate = metrics['win_rate'] / 100.0
-                metrics['winning_trades'] = int(total_trades * winrate)
-                metrics['losing_trades'] = total_trades - metrics['winning_trades']
-                
-                # Extract average duration if available
-                avg_duration = backtest_data.get('holding_avg', '')
-                metrics['avg_duration'] = avg_duration
-                
-                logger.debug(f"Parsed metrics for {strategy_name}: {metrics['total_profit_percent']:.2f}% return, {metrics['total_trades']} trades")
-                return metrics
+                self._extract_direct(backtest_data, metrics)
             
             else:
                 logger.warning(f"Unrecognized backtest data structure in {strategy_dir}")
                 return None
+            
+            logger.debug("Parsed metrics for %s: %.2f%% return, %s trades", strategy_name, metrics['total_profit_percent'], metrics['total_trades'])
+            return metrics
                 
         except Exception as e:
             logger.error(f"Error parsing JSON data for {strategy_dir.name}: {e}")
             return None
     
-    def discover_all_successful_strategies(self) -> Tuple[List[str], Dict[str, Dict]]:
+    def _extract_comparison(self, backtest_data: Dict, comparison_data: Dict, metrics: Dict):
+        """Fill metrics from a strategy_comparison entry (newer format) and the root-level fields."""
+        metrics['total_trades'] = comparison_data.get('trades', 0)
+        metrics['total_profit_percent'] = comparison_data.get('profit_total_pct', 0.0)
+        metrics['total_profit_abs'] = comparison_data.get('profit_total_abs', 0.0)
+        metrics['win_rate'] = comparison_data.get('winrate', 0.0) * 100  # Convert to percentage
+        metrics['profit_factor'] = comparison_data.get('profit_factor', 0.0)
+        metrics['sharpe_ratio'] = comparison_data.get('sharpe', 0.0)
+        metrics['max_drawdown'] = comparison_data.get('max_drawdown_account', 0.0) * 100  # Convert to percentage
+        metrics['avg_profit'] = comparison_data.get('profit_mean_pct', 0.0)
+        metrics['cagr'] = comparison_data.get('cagr', 0.0) * 100  # Convert to percentage
+        metrics['expectancy'] = comparison_data.get('expectancy', 0.0)
+        metrics['sortino'] = comparison_data.get('sortino', 0.0)
+        metrics['calmar'] = comparison_data.get('calmar', 0.0)
+        metrics['sqn'] = comparison_data.get('sqn', 0.0)
+        metrics['winning_trades'] = comparison_data.get('wins', 0)
+        metrics['losing_trades'] = comparison_data.get('losses', 0)
+        metrics['avg_duration'] = comparison_data.get('duration_avg', '')
+        
+        # Extract backtest dates and other info from root level if available
+        if 'backtest_start' in backtest_data:
+            metrics['backtest_start'] = backtest_data.get('backtest_start', '')
+            metrics['backtest_end'] = backtest_data.get('backtest_end', '')
+            metrics['market_change'] = backtest_data.get('market_change', 0.0)
+        
+        # Extract best/worst pairs from root level if available
+        best_pair_data = backtest_data.get('best_pair', {})
+        worst_pair_data = backtest_data.get('worst_pair', {})
+        if best_pair_data:
+            metrics['best_pair'] = best_pair_data.get('key', '')
+        if worst_pair_data:
+            metrics['worst_pair'] = worst_pair_data.get('key', '')
+    
+    def _extract_direct(self, backtest_data: Dict, metrics: Dict):
+        """Fill metrics from the direct format, which keeps them at root level."""
+        metrics['total_trades'] = backtest_data.get('total_trades', 0)
+        metrics['total_profit_percent'] = backtest_data.get('profit_total_pct', 0.0)
+        metrics['total_profit_abs'] = backtest_data.get('profit_total_abs', 0.0)
+        metrics['win_rate'] = backtest_data.get('winrate', 0.0) * 100  # Convert to percentage
+        metrics['profit_factor'] = backtest_data.get('profit_factor', 0.0)
+        metrics['sharpe_ratio'] = backtest_data.get('sharpe', 0.0)
+        metrics['max_drawdown'] = backtest_data.get('max_drawdown_account', 0.0) * 100  # Convert to percentage
+        metrics['avg_profit'] = backtest_data.get('profit_mean_pct', 0.0)
+        metrics['cagr'] = backtest_data.get('cagr', 0.0)
+        metrics['expectancy'] = backtest_data.get('expectancy', 0.0)
+        metrics['sortino'] = backtest_data.get('sortino', 0.0)
+        metrics['calmar'] = backtest_data.get('calmar', 0.0)
+        metrics['sqn'] = backtest_data.get('sqn', 0.0)
+        metrics['backtest_start'] = backtest_data.get('backtest_start', '')
+        metrics['backtest_end'] = backtest_data.get('backtest_end', '')
+        metrics['market_change'] = backtest_data.get('market_change', 0.0)
+        
+        # Extract best/worst pairs if available
+        best_pair_data = backtest_data.get('best_pair', {})
+        worst_pair_data = backtest_data.get('worst_pair', {})
+        if best_pair_data:
+            metrics['best_pair'] = best_pair_data.get('key', '')
+        if worst_pair_data:
+            metrics['worst_pair'] = worst_pair_data.get('key', '')
+        
+        # Calculate wins/losses from winrate and total trades
+        total_trades = metrics['total_trades']
+        winrate = metrics['win_rate'] / 100.0
+        metrics['winning_trades'] = int(total_trades * winrate)
+        metrics['losing_trades'] = total_trades - metrics['winning_trades']
+        
+        # Extract average duration if available
+        avg_duration = backtest_data.get('holding_avg', '')
+        metrics['avg_duration'] = avg_duration
+    
+    def _scan_all(self) -> Tuple[Dict[str, Dict], List[Dict]]:
         """
-        Discover all strategies that have successful backtest results.
+        Classify every strategy directory as successful or failed in a single pass.
         
         Returns:
-            Tuple of (strategy_names_list, results_dict)
+            Tuple of (results_dict, failed_strategies_list) for the strategy directories only
         """
-        successful_strategies = []
         results = {}
-        
-        if not self.results_dir.exists():
-            logger.warning(f"Results directory not found: {self.results_dir}")
-            return [], {}
-        
-        success_count = 0
+        failed_strategies = []
         
         # Scan all strategy directories for backtest results
-        for strategy_dir in self.results_dir.iterdir():
-            if not strategy_dir.is_dir() or strategy_dir.name in ['individual_results']:
-                continue
-            
-            # Try to parse JSON backtest data
-            metrics = self.parse_strategy_json_data(strategy_dir)
+        strategy_dirs = self._list_strategy_dirs()
+        
+        # Try to parse JSON backtest data; directories without it are checked for failure indicators
+        for strategy_dir, metrics in zip(strategy_dirs, self.parse_strategy_dirs(strategy_dirs)):
             if metrics:
                 strategy_name = metrics['strategy']
-                successful_strategies.append(strategy_name)
                 results[strategy_name] = metrics
-                success_count += 1
-                logger.debug(f"Found successful strategy: {strategy_name}")
+                logger.debug("Found successful strategy: %s", strategy_name)
+                continue
+            
+            if _has_failure_marker(strategy_dir):
+                failed_strategies.append(self._failed_dir_result(strategy_dir))
         
+        return results, failed_strategies
+    
+    def _list_strategy_dirs(self) -> List[Path]:
+        """List the strategy directories; scandir entries answer is_dir() without a stat."""
+        with os.scandir(self.results_dir) as entries:
+            return [Path(entry.path) for entry in entries
+                    if entry.name not in ['individual_results'] and entry.is_dir()]
+    
+    def _failed_dir_result(self, strategy_dir: Path) -> Dict:
+        """Build the failed result for a strategy directory holding failure indicators."""
+        logger.debug("Detected failed strategy: %s", strategy_dir.name)
+        return {
+            'strategy': strategy_dir.name,
+            'error': 'Backtest failed',
+            'failed_timestamp': datetime.now().isoformat()
+        }
+    
+    def _list_individual_results(self) -> Dict[str, List[Tuple[Path, str]]]:
+        """
+        List the individual_results result and failed files with one directory read.
+        
+        Returns:
+            Dict keyed 'result' / 'failed' of (file_path, strategy_name_from_filename) lists
+        """
+        files = {'result': [], 'failed': []}
+        try:
+            with os.scandir(self.individual_results_dir) as entries:
+                for entry in entries:
+                    name = entry.name
+                    match = INDIVIDUAL_RESULT_RE.search(name)
+                    if match:
+                        files[match.group(1)].append((Path(entry.path), name[:match.start()]))
+        except FileNotFoundError:
+            pass
+        return files
+    
+    def _add_cached_results(self, results: Dict[str, Dict], result_files: List[Tuple[Path, str]]) -> List[str]:
+        """Add results from the individual_results result files to results and return the sorted strategy names."""
         # Also check the individual_results directory for any cached results
-        if self.individual_results_dir.exists():
+        if result_files:
             # Load successful results from individual files
-            for result_file in self.individual_results_dir.glob("*_result.json"):
+            loaded = self._thread_map(_load_json_file, [result_file for result_file, _ in result_files])
+            for (result_file, file_strategy), (result, error) in zip(result_files, loaded):
+                if error is not None:
+                    logger.warning(f"Could not load result from {result_file}: {error}")
+                    continue
                 try:
-                    with open(result_file, 'r') as f:
-                        result = json.load(f)
-                        strategy_name = result.get('strategy', result_file.stem.replace('_result', ''))
-                        if strategy_name not in results:  # Don't override directory-based results
-                            successful_strategies.append(strategy_name)
-                            results[strategy_name] = result
-                            success_count += 1
-                            logger.debug(f"Found cached successful strategy: {strategy_name}")
+                    strategy_name = result.get('strategy', file_strategy)
+                    if strategy_name not in results:  # Don't override directory-based results
+                        results[strategy_name] = result
+                        logger.debug("Found cached successful strategy: %s", strategy_name)
                 except Exception as e:
                     logger.warning(f"Could not load result from {result_file}: {e}")
         
-        # Remove duplicates and sort
-        successful_strategies = sorted(list(set(successful_strategies)))
+        # The results keys are already unique, so sorting them gives the name list
+        successful_strategies = sorted(results)
         
         logger.info(f"Found {len(successful_strategies)} previously successful strategies")
-        return successful_strategies, results
+        return successful_strategies
     
-    def get_failed_strategies(self) -> List[Dict]:
-        """Get list of strategies that failed during backtesting."""
-        failed_strategies = []
-        
-        if not self.results_dir.exists():
-            return failed_strategies
-        
-        # Scan strategy directories for failed result indicators
-        for strategy_dir in self.results_dir.iterdir():
-            if not strategy_dir.is_dir() or strategy_dir.name in ['individual_results']:
-                continue
-            
-            # Check if this strategy has successful results
-            metrics = self.parse_strategy_json_data(strategy_dir)
-            if not metrics:
-                # If no successful results found, check for failed result indicators
-                failed_indicators = list(strategy_dir.glob("*_failed*")) + list(strategy_dir.glob("*error*"))
-                if failed_indicators:
-                    failed_result = {
-                        'strategy': strategy_dir.name,
-                        'error': 'Backtest failed',
-                        'failed_timestamp': datetime.now().isoformat()
-                    }
-                    failed_strategies.append(failed_result)
-                    logger.debug(f"Detected failed strategy: {strategy_dir.name}")
-        
+    def _add_cached_failures(self, failed_strategies: List[Dict], failed_files: List[Tuple[Path, str]]) -> List[Dict]:
+        """Append failed results from the individual_results failed files to failed_strategies."""
         # Also check the individual_results directory for cached failed results
-        if self.individual_results_dir.exists():
-            for failed_file in self.individual_results_dir.glob("*_failed.json"):
+        if failed_files:
+            # Strategy names already in the list, so duplicates are found without rescanning it
+            seen = {fs.get('strategy') for fs in failed_strategies}
+            loaded = self._thread_map(_load_json_file, [failed_file for failed_file, _ in failed_files])
+            for (failed_file, file_strategy), (failed_result, error) in zip(failed_files, loaded):
+                if error is not None:
+                    logger.warning(f"Could not load failed result from {failed_file}: {error}")
+                    continue
                 try:
-                    with open(failed_file, 'r') as f:
-                        failed_result = json.load(f)
-                        strategy_name = failed_result.get('strategy', failed_file.stem.replace('_failed', ''))
-                        # Only add if we don't already have this strategy
-                        if not any(fs.get('strategy') == strategy_name for fs in failed_strategies):
-                            failed_strategies.append(failed_result)
-                            logger.debug(f"Found cached failed strategy: {strategy_name}")
+                    strategy_name = failed_result.get('strategy', file_strategy)
+                    # Only add if we don't already have this strategy
+                    if strategy_name not in seen:
+                        seen.add(failed_result.get('strategy'))
+                        failed_strategies.append(failed_result)
+                        logger.debug("Found cached failed strategy: %s", strategy_name)
                 except Exception as e:
                     logger.warning(f"Could not load failed result from {failed_file}: {e}")
         
         return failed_strategies
     
+    def discover_all_successful_strategies(self) -> Tuple[List[str], Dict[str, Dict]]:
+        """
+        Discover all strategies that have successful backtest results.
+        
+        Returns:
+            Tuple of (strategy_names_list, results_dict)
+        """
+        if not self.results_dir.exists():
+            logger.warning(f"Results directory not found: {self.results_dir}")
+            return [], {}
+        
+        results, _ = self._scan_all()
+        successful_strategies = self._add_cached_results(results, self._list_individual_results()['result'])
+        return successful_strategies, results
+    
+    def get_failed_strategies(self, exclude: Optional[Set[str]] = None) -> List[Dict]:
+        """
+        Get list of strategies that failed during backtesting.
+        
+        Args:
+            exclude: Names of strategies already known to be successful; when given, the other
+                     directories are only checked for failure indicators instead of being parsed
+        
+        Returns:
+            List of failed result dicts
+        """
+        if not self.results_dir.exists():
+            return []
+        
+        if exclude is None:
+            _, failed_strategies = self._scan_all()
+        else:
+            failed_strategies = [self._failed_dir_result(strategy_dir) for strategy_dir in self._list_strategy_dirs()
+                                 if strategy_dir.name not in exclude and _has_failure_marker(strategy_dir)]
+        return self._add_cached_failures(failed_strategies, self._list_individual_results()['failed'])
+    
     def collect_all_results(self) -> Tuple[Dict[str, Dict], List[Dict]]:
         """
         Collect all existing results from strategy directories.
@@ -313,18 +485,35 @@ class StrategyResultsUtils:
         Returns:
             Tuple of (successful_results_dict, failed_strategies_list)
         """
-        successful_strategies, results = self.discover_all_successful_strategies()
-        failed_strategies = self.get_failed_strategies()
+        if not self.results_dir.exists():
+            logger.warning(f"Results directory not found: {self.results_dir}")
+            results, failed_strategies = {}, []
+        else:
+            # One directory pass feeds both the successful and the failed results
+            results, failed_strategies = self._scan_all()
+            individual_files = self._list_individual_results()
+            self._add_cached_results(results, individual_files['result'])
+            self._add_cached_failures(failed_strategies, individual_files['failed'])
         
         logger.info(f"📊 Found {len(results)} successful and {len(failed_strategies)} failed backtest results")
         return results, failed_strategies
 
 
-def get_strategy_results_utils(results_dir: str = "user_data/backtest_results") -> StrategyResultsUtils:
-    """Factory function to create a StrategyResultsUtils instance."""
+@lru_cache(maxsize=8)
+def _get_utils_cached(results_dir: str) -> StrategyResultsUtils:
+    """
+    Shared StrategyResultsUtils per results directory, so repeated calls reuse its parse cache.
+    
+    Callers that change attributes of the returned instance should call _get_utils_cached.cache_clear().
+    """
     return StrategyResultsUtils(results_dir)
 
 
+def get_strategy_results_utils(results_dir: str = "user_data/backtest_results") -> StrategyResultsUtils:
+    """Factory function returning the shared StrategyResultsUtils instance for results_dir."""
+    return _get_utils_cached(results_dir)
+
+
 def discover_successful_strategies(results_dir: str = "user_data/backtest_results") -> List[str]:
     """
     Convenience function to get just the list of successful strategy names.
@@ -335,7 +524,7 @@ def discover_successful_strategies(results_dir: str = "user_data/backtest_result
     Returns:
         List of successful strategy names
     """
-    utils = StrategyResultsUtils(results_dir)
+    utils = _get_utils_cached(results_dir)
     successful_strategies, _ = utils.discover_all_successful_strategies()
     return successful_strategies
 
@@ -350,5 +539,31 @@ def get_all_strategy_results(results_dir: str = "user_data/backtest_results") ->
     Returns:
         Tuple of (successful_results_dict, failed_strategies_list)
     """
-    utils = StrategyResultsUtils(results_dir)
-    return utils.collect_all_results() 
\ No newline at end of file
+    utils = _get_utils_cached(results_dir)
+    return utils.collect_all_results() 
+
+
+# Report table formats; feather and parquet need pyarrow installed
+REPORT_FORMATS = ('csv', 'feather', 'parquet')
+
+
+def save_dataframe(df, file_path: Path, output_format: str = 'csv') -> Path:
+    """
+    Write a report DataFrame in the requested format.
+    
+    Args:
+        df: DataFrame to write
+        file_path: Report path; its suffix is replaced to match the format
+        output_format: One of REPORT_FORMATS
+        
+    Returns:
+        Path of the written file
+    """
+    file_path = Path(file_path).with_suffix(f".{output_format}")
+    if output_format == 'feather':
+        df.reset_index(drop=True).to_feather(file_path, compression='zstd')
+    elif output_format == 'parquet':
+        df.to_parquet(file_path, compression='zstd', index=False)
+    else:
+        df.to_csv(file_path, index=False)
+    return file_path
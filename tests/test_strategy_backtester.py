@@ -0,0 +1,351 @@
+#!/usr/bin/env python3
+"""
+Tests for the adaptive worker sizing, backtest process cleanup and batch result merging in strategy_backtester.
+Run with: python -m unittest discover tests
+"""
+
+import os
+import sys
+import asyncio
+import tempfile
+import unittest
+from types import SimpleNamespace
+from unittest import mock
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'strategy_tools'))
+import strategy_backtester
+
+GB = 1024 ** 3
+
+
+def make_backtester(max_workers: int) -> strategy_backtester.StrategyBacktester:
+    """Backtester with only the worker sizing state set up, skipping the filesystem setup in __init__."""
+    backtester = strategy_backtester.StrategyBacktester.__new__(strategy_backtester.StrategyBacktester)
+    backtester.max_workers = max_workers
+    backtester.adaptive_workers = True
+    backtester.rss_samples_before_tuning = 3
+    backtester.memory_headroom = 0.8
+    backtester._peak_rss_samples = [2 * GB] * 3
+    backtester._shrink_acquires = set()
+    backtester._running_backtests = 0
+    backtester._memory_sample = None
+    backtester._tuned_sample_seq = 0
+    return backtester
+
+
+def take_reading(backtester: strategy_backtester.StrategyBacktester, available: float, running: int):
+    """Record a fake memory sample of a 32 GB machine taken while running backtests hold slots."""
+    backtester._running_backtests = running
+    backtester._record_memory_sample(SimpleNamespace(percent=100 * (1 - available / (32 * GB)),
+                                                     available=available, total=32 * GB))
+
+
+async def free_slots(sem: asyncio.Semaphore) -> int:
+    """Count the slots that can be taken without waiting, then hand them back."""
+    await asyncio.sleep(0)  # Let pending shrink acquires run first
+    taken = 0
+    while not sem.locked():
+        await sem.acquire()
+        taken += 1
+    for _ in range(taken):
+        sem.release()
+    return taken
+
+
+class MemoryWorkerTargetTest(unittest.TestCase):
+    def setUp(self):
+        patcher = mock.patch.object(strategy_backtester.multiprocessing, 'cpu_count', return_value=16)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+    
+    def test_no_target_before_enough_samples(self):
+        backtester = make_backtester(4)
+        backtester._peak_rss_samples = [2 * GB]
+        take_reading(backtester, 8 * GB, running=4)
+        self.assertIsNone(backtester.get_memory_worker_target())
+    
+    def test_no_target_without_memory_sample(self):
+        self.assertIsNone(make_backtester(4).get_memory_worker_target())
+    
+    def test_running_workers_count_towards_target(self):
+        # 4 workers at 2 GB with 8 GB free and a 6.4 GB reserve: nothing more fits, none need to go
+        backtester = make_backtester(4)
+        take_reading(backtester, 8 * GB, running=4)
+        self.assertEqual(backtester.get_memory_worker_target(), 4)
+    
+    def test_target_based_on_running_backtests_not_limit(self):
+        # Late in a run only one backtest is left; the limit of 6 must not be counted as running
+        backtester = make_backtester(6)
+        take_reading(backtester, 8 * GB, running=1)
+        self.assertEqual(backtester.get_memory_worker_target(), 1)
+    
+    def test_target_capped_at_cpu_count(self):
+        backtester = make_backtester(4)
+        take_reading(backtester, 40 * GB, running=4)
+        self.assertEqual(backtester.get_memory_worker_target(), 16)
+    
+    def test_unchanged_reading_does_not_grow_again(self):
+        async def run():
+            backtester = make_backtester(2)
+            sem = asyncio.Semaphore(2)
+            take_reading(backtester, 12.4 * GB, running=2)
+            target = backtester.get_memory_worker_target()
+            self.assertEqual(target, 5)
+            backtester._resize_worker_limit(sem, target)
+            
+            # Same reading again: no new sample since the resize, so no new target
+            self.assertIsNone(backtester.get_memory_worker_target())
+            
+            # A new sample before the released slots have started still counts two running backtests
+            take_reading(backtester, 12.4 * GB, running=2)
+            self.assertEqual(backtester.get_memory_worker_target(), 5)
+        
+        asyncio.run(run())
+    
+    def test_shrink_then_grow(self):
+        async def run():
+            backtester = make_backtester(4)
+            sem = asyncio.Semaphore(4)
+            
+            # Memory pressure: 4 GB free is below the reserve, so two workers have to go
+            take_reading(backtester, 4 * GB, running=4)
+            target = backtester.get_memory_worker_target()
+            self.assertEqual(target, 2)
+            backtester._resize_worker_limit(sem, target)
+            self.assertEqual(await free_slots(sem), 2)
+            
+            # The two stopped backtests free their memory; the target must not bounce back up
+            take_reading(backtester, 8 * GB, running=2)
+            self.assertEqual(backtester.get_memory_worker_target(), 2)
+            
+            # Memory frees up elsewhere: three more workers fit
+            take_reading(backtester, 12.4 * GB, running=2)
+            target = backtester.get_memory_worker_target()
+            self.assertEqual(target, 5)
+            backtester._resize_worker_limit(sem, target)
+            self.assertEqual(await free_slots(sem), 5)
+            self.assertFalse(backtester._shrink_acquires)
+        
+        asyncio.run(run())
+    
+    def test_pending_shrink_acquires_cancelled(self):
+        async def run():
+            backtester = make_backtester(4)
+            sem = asyncio.Semaphore(4)
+            for _ in range(4):
+                await sem.acquire()  # All slots busy with running backtests
+            
+            backtester._resize_worker_limit(sem, 2)
+            await asyncio.sleep(0)
+            acquires = list(backtester._shrink_acquires)
+            self.assertEqual(len(acquires), 2)
+            self.assertFalse(any(acquire.done() for acquire in acquires))
+            
+            backtester._cancel_shrink_acquires()
+            await asyncio.sleep(0)
+            self.assertTrue(all(acquire.cancelled() for acquire in acquires))
+            self.assertFalse(backtester._shrink_acquires)
+        
+        asyncio.run(run())
+    
+    def test_backtest_slot_counts_running_backtests(self):
+        async def run():
+            backtester = make_backtester(2)
+            sem = asyncio.Semaphore(2)
+            async with backtester._backtest_slot(sem):
+                self.assertEqual(backtester._running_backtests, 1)
+            self.assertEqual(backtester._running_backtests, 0)
+        
+        asyncio.run(run())
+
+
+class MergeBatchFailuresTest(unittest.TestCase):
+    def make_backtester(self) -> strategy_backtester.StrategyBacktester:
+        """Backtester writing failure records to a temporary individual_results directory."""
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        backtester = make_backtester(1)
+        backtester.adaptive_workers = False
+        backtester.individual_results_dir = strategy_backtester.Path(tmp.name)
+        backtester._parsed_result_files = {}
+        backtester._result_file_names = set()
+        backtester._results_name_set = set()
+        backtester._failed_name_set = set()
+        backtester._saved_failures = {}
+        backtester._pending_index_entries = {}
+        backtester._current_memory = 0.0
+        backtester._current_cpu = 0.0
+        backtester.results = {}
+        backtester.failed_strategies = [{'strategy': 'Retried', 'error': 'old failure'},
+                                        {'strategy': 'Other', 'error': 'kept'}]
+        return backtester
+    
+    def test_saved_failure_records_are_merged(self):
+        backtester = self.make_backtester()
+        
+        async def fake_worker(sem, strategy_name):
+            if strategy_name == 'Raises':
+                raise RuntimeError('worker crashed')
+            backtester.save_failed_result(strategy_name, {
+                'strategy': strategy_name,
+                'error': 'freqtrade exited with status 2',
+                'stdout': 'partial output',
+                'failed_timestamp': '2024-01-01T00:00:00',
+                'backtest_config': {'start_date': '20240101', 'end_date': '20241231'}
+            })
+            return None
+        
+        backtester._run_backtest_worker_async = fake_worker
+        asyncio.run(backtester._run_parallel_backtests_async(['Retried', 'Raises']))
+        
+        failed = {fs['strategy']: fs for fs in backtester.failed_strategies}
+        self.assertEqual(set(failed), {'Retried', 'Other', 'Raises'})
+        # The full record saved to individual_results replaces the earlier failure
+        self.assertEqual(failed['Retried']['error'], 'freqtrade exited with status 2')
+        self.assertEqual(failed['Retried']['stdout'], 'partial output')
+        self.assertIn('backtest_config', failed['Retried'])
+        self.assertEqual(failed['Other']['error'], 'kept')
+        # Only a worker exception falls back to a stub
+        self.assertEqual(failed['Raises'], {'strategy': 'Raises', 'error': 'worker crashed'})
+        self.assertFalse(backtester._saved_failures)
+
+
+class ResultIndexBatchingTest(unittest.TestCase):
+    def test_index_is_written_once_per_batch(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        backtester = make_backtester(1)
+        backtester.individual_results_dir = strategy_backtester.Path(tmp.name)
+        backtester.result_index_file = backtester.individual_results_dir / "_index.json"
+        backtester._result_index = {}
+        backtester._pending_index_entries = {}
+        backtester._parsed_result_files = {}
+        backtester._result_file_names = set()
+        backtester._results_name_set = set()
+        backtester._failed_name_set = set()
+        backtester.results = {}
+        backtester.failed_strategies = []
+        # Entry written meanwhile by another backtester sharing the directory
+        backtester.write_json_atomic(backtester.result_index_file, {'Elsewhere': ['a', 'b', 'Elsewhere_result.json', 'x']})
+        
+        result = {'backtest_config': {'start_date': '20240101', 'end_date': '20240331'}, 'input_digest': 'd'}
+        with mock.patch.object(backtester, 'write_json_atomic', wraps=backtester.write_json_atomic) as write:
+            backtester.save_strategy_result('First', result)
+            backtester.save_strategy_result('Second', result)
+            index_writes = [c for c in write.call_args_list if c.args[0] == backtester.result_index_file]
+            self.assertEqual(index_writes, [])
+            
+            backtester.merge_batch_results({'First': result, 'Second': result}, [])
+            index_writes = [c for c in write.call_args_list if c.args[0] == backtester.result_index_file]
+            self.assertEqual(len(index_writes), 1)
+        
+        index = strategy_backtester.json_loads(backtester.result_index_file.read_bytes())
+        self.assertEqual(set(index), {'Elsewhere', 'First', 'Second'})
+        self.assertEqual(index['First'], ['20240101', '20240331', 'First_result.json', 'd'])
+        self.assertEqual(backtester._result_index, index)
+        self.assertFalse(backtester._pending_index_entries)
+
+
+class FakeBacktesting:
+    """Just the Backtesting attributes reuse_backtest_data relies on."""
+    
+    def __init__(self, timeframe: str, required_startup: int, loads: list):
+        self.timeframe = timeframe
+        self.required_startup = required_startup
+        self.pairlists = SimpleNamespace(whitelist=['BTC/USDT', 'ETH/USDT'])
+        self.timerange = None
+        self.loads = loads
+    
+    def load_bt_data(self):
+        self.loads.append(self.timeframe)
+        return {'BTC/USDT': self.timeframe}, f"timerange-{self.timeframe}-{self.required_startup}"
+
+
+class BacktestDataReuseTest(unittest.TestCase):
+    def test_data_is_loaded_once_per_timeframe_and_startup(self):
+        backtester = make_backtester(1)
+        backtester._bt_data_cache = {}
+        loads = []
+        
+        runs = []
+        for timeframe, startup in [('5m', 30), ('5m', 30), ('1h', 30), ('5m', 200), ('5m', 30)]:
+            backtesting = FakeBacktesting(timeframe, startup, loads)
+            backtester.reuse_backtest_data(backtesting)
+            runs.append((backtesting, backtesting.load_bt_data()))
+        
+        # Same timeframe, startup candles and pairs share one load; anything else loads its own data
+        self.assertEqual(loads, ['5m', '1h', '5m'])
+        self.assertIs(runs[1][1], runs[0][1])
+        self.assertIs(runs[4][1], runs[0][1])
+        # A reused load also hands over the timerange adjusted for the startup candles
+        self.assertEqual(runs[1][0].timerange, 'timerange-5m-30')
+        self.assertEqual(runs[3][1][1], 'timerange-5m-200')
+
+
+class FakeBacktestProcess:
+    """freqtrade subprocess stand-in whose stdout fails like an over-long line does."""
+    
+    def __init__(self):
+        self.pid = 4242
+        self.returncode = None
+        self.stderr = SimpleNamespace(read=self._read_stderr)
+    
+    @property
+    def stdout(self):
+        return self
+    
+    def __aiter__(self):
+        return self
+    
+    async def __anext__(self):
+        raise ValueError('Separator is not found, and chunk exceed the limit')
+    
+    async def _read_stderr(self):
+        return b''
+    
+    async def wait(self):
+        return self.returncode
+
+
+class BacktestProcessCleanupTest(unittest.TestCase):
+    def test_streaming_error_kills_process_group(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        backtester = make_backtester(1)
+        backtester.results_dir = strategy_backtester.Path(tmp.name)
+        backtester.individual_results_dir = strategy_backtester.Path(tmp.name)
+        backtester.config_path = 'config.json'
+        backtester.start_date, backtester.end_date = '20240101', '20241231'
+        backtester.strategy_timeout = 5
+        backtester._parsed_result_files = {}
+        backtester._result_file_names = set()
+        backtester._failed_name_set = set()
+        backtester._saved_failures = {}
+        backtester.load_existing_result = lambda strategy_name: None
+        backtester.detect_strategy_timeframe = lambda strategy_name: '5m'
+        backtester.cleanup_failed_strategy_directory = lambda strategy_dir, strategy_name: None
+        
+        async def no_rss_sampling(pid, peak_rss):
+            return None
+        backtester._sample_peak_rss = no_rss_sampling
+        
+        proc = FakeBacktestProcess()
+        
+        def kill(pid):
+            proc.returncode = -9
+        backtester.kill_process_group = mock.Mock(side_effect=kill)
+        
+        async def fake_exec(*args, **kwargs):
+            return proc
+        
+        with mock.patch.object(strategy_backtester.asyncio, 'create_subprocess_exec', fake_exec):
+            result = asyncio.run(backtester._run_backtest_worker_async(asyncio.Semaphore(1), 'LongLines'))
+        
+        self.assertIsNone(result)
+        backtester.kill_process_group.assert_called_once_with(proc.pid)
+        self.assertEqual(backtester._running_backtests, 0)
+        self.assertIn('chunk exceed the limit', backtester._saved_failures['LongLines']['error'])
+
+
+if __name__ == '__main__':
+    unittest.main()